@@ -1,11 +1,75 @@
 import os
+import sys
+import stat
 import shutil
 import csv
+import codecs
+import collections
 import json
-import uuid
 import time
 from datetime import datetime
 import concurrent.futures
+import functools
+import itertools
+import logging
+
+# 可选依赖：安装了 chardet 时用它推断CSV编码
+try:
+    import chardet
+except ImportError:
+    chardet = None
+
+# 可选依赖：安装了 orjson 时用它读写历史记录，否则使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 没有零拷贝快速路径（sendfile 等）的平台上，shutil 复制时使用 1MiB 缓冲区
+shutil.COPY_BUFSIZE = 1024 * 1024
+
+# Linux 上可由内核直接在文件之间复制数据（支持写时复制/服务端复制的文件系统上不实际搬运数据）
+_HAS_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+# 逐行处理的过程信息通过日志输出，未达到日志级别时不会格式化字符串
+log = logging.getLogger("pyzard")
+
+
+class _BufferedStdoutHandler(logging.Handler):
+    """把日志攒成一批后一次写入标准输出
+
+    逐条 write + flush 在大量小文件的场景下开销明显；警告及以上级别的日志立即输出。
+    """
+
+    def __init__(self, capacity=100):
+        super().__init__()
+        self.capacity = capacity
+        self.lines = []
+
+    def emit(self, record):
+        try:
+            self.lines.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.lines) >= self.capacity or record.levelno >= logging.WARNING:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.lines:
+                sys.stdout.write("\n".join(self.lines) + "\n")
+                sys.stdout.flush()
+                self.lines = []
+        finally:
+            self.release()
+
+
+def _flush_log():
+    """输出缓冲中的日志，保证与之后 print 的内容顺序一致"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
 
 
 # 冲突处理模式定义
@@ -19,6 +83,92 @@ CONFLICT_MODES = {
 # 默认冲突处理模式
 DEFAULT_CONFLICT_MODE = "copy"
 
+# CSV中的一行：源名称、目标名称、行号
+Row = collections.namedtuple("Row", "source_name target_name row_number")
+
+# 本次操作中已确认存在的目标目录，每个顶层操作开始时清空
+_ensured_dirs = set()
+
+# 多字节编码（codecs 规范名称）。单字节编码解码任何字节都不会失败，
+# 而 chardet 常把较短的 GBK 样本误判为 ISO-8859-1、IBM855 等单字节编码，
+# 所以只有推断为多字节编码时才排在 GBK 之前尝试
+_MULTIBYTE_ENCODINGS = {
+    "utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "utf-32",
+    "gbk", "gb18030", "hz", "big5", "big5hkscs",
+    "euc_jp", "shift_jis", "cp932", "iso2022_jp", "euc_kr", "cp949", "iso2022_kr", "johab",
+}
+
+
+def detect_file_encoding(file_path, sample_size=64 * 1024):
+    """根据文件开头的样本推断编码，避免整文件反复尝试解码
+
+    依次检查BOM、UTF-8合法性；若安装了 chardet，再用它判断其余编码。
+
+    Args:
+        file_path: 文件路径
+        sample_size: 读取的样本字节数（默认64KiB）
+    Returns:
+        tuple: (推断的编码（codecs 规范名称）或None, 样本是否为合法UTF-8)
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_size)
+
+    # BOM 检查
+    if sample.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig", True
+    if sample.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16", False
+
+    # UTF-8 检查（样本末尾可能截断多字节字符，使用增量解码器）
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8-sig", True
+    except UnicodeDecodeError:
+        pass
+
+    # 可选：使用 chardet 判断其他编码
+    if chardet is None:
+        return None, False
+
+    result = chardet.detect(sample)
+    encoding = (result.get("encoding") or "").lower()
+    if not encoding or (result.get("confidence") or 0) < 0.5:
+        return None, False
+    try:
+        encoding = codecs.lookup(encoding).name
+    except LookupError:
+        # Python 不支持的编码（如 EUC-TW）
+        return None, False
+    # GB2312 是 GBK 的子集，统一使用 GBK 解码
+    if encoding == "gb2312":
+        encoding = "gbk"
+    return encoding, False
+
+
+def iter_csv_rows(f, expected_columns=2):
+    """逐行解析已打开的CSV文件，跳过空行
+
+    Args:
+        f: 以文本模式打开的CSV文件对象
+        expected_columns: 期望的列数（默认2列：源名称，目标名称）；
+            超出的列忽略并给出警告，为1时只读取源名称
+    Yields:
+        Row: (源名称, 目标名称, 行号)；列数不足时目标名称使用源名称
+    """
+    for i, row in enumerate(csv.reader(f), 1):
+        if not row:  # 跳过空行
+            continue
+        # 超出的列有内容时提示（末尾的空列通常是表格软件导出时多出的分隔符）
+        if any(cell.strip() for cell in row[expected_columns:]):
+            log.warning("  警告: 第 %d 行有 %d 列，只使用前 %d 列", i, len(row), expected_columns)
+        source_name = row[0].strip()
+        # 处理列数不足的情况：目标名称使用源名称
+        if len(row) < 2 or expected_columns < 2:
+            target_name = source_name
+        else:
+            target_name = row[1].strip()
+        yield Row(source_name, target_name, i)
+
 
 def read_csv_with_encoding_detection(csv_path, expected_columns=2):
     """
@@ -29,44 +179,35 @@ def read_csv_with_encoding_detection(csv_path, expected_columns=2):
         expected_columns: 期望的列数（默认2列：源名称，目标名称）
 
     Returns:
-        dict: 包含处理后的数据和元信息
+        dict: 包含处理后的数据和元信息，data 为 Row 列表
     """
     # 支持的编码尝试顺序
     encodings = ["utf-8-sig", "gbk", "gb2312", "utf-8", "latin-1"]
 
+    # 先用文件开头的样本推断编码，推断成功时只需解码一次
+    try:
+        detected, sample_is_utf8 = detect_file_encoding(csv_path)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"读取文件时发生错误: {str(e)}",
+            "encoding": "unknown",
+        }
+    if not sample_is_utf8:
+        # 样本已不是合法UTF-8，整文件也不可能是
+        encodings = [e for e in encodings if e not in ("utf-8-sig", "utf-8")]
+    if detected in _MULTIBYTE_ENCODINGS:
+        encodings = [detected] + [e for e in encodings if e != detected]
+    elif detected:
+        # 单字节编码只作为 GBK 解码失败后的候选
+        encodings = [e for e in encodings if e not in (detected, "latin-1")] + [detected, "latin-1"]
+
     for encoding in encodings:
         try:
-            with open(csv_path, "r", encoding=encoding, newline="") as f:
-                reader = csv.reader(f)
-
+            # 较大的读缓冲减少大CSV文件的读取次数
+            with open(csv_path, "r", encoding=encoding, newline="", buffering=1024 * 1024) as f:
                 # 读取并处理数据
-                rows = []
-                for i, row in enumerate(reader, 1):
-                    if not row:  # 跳过空行
-                        continue
-
-                    # 处理列数不足的情况
-                    if len(row) < expected_columns:
-                        # 如果只有一列，目标名称使用源名称
-                        source_name = row[0].strip()
-                        if len(row) == 1:
-                            target_name = source_name
-                        else:
-                            target_name = (
-                                row[1].strip() if len(row) > 1 else source_name
-                            )
-                    else:
-                        source_name = row[0].strip()
-                        target_name = row[1].strip()
-
-                    rows.append(
-                        {
-                            "source_name": source_name,
-                            "target_name": target_name,
-                            "original_row": row,
-                            "row_number": i,
-                        }
-                    )
+                rows = list(iter_csv_rows(f, expected_columns))
 
                 return {
                     "success": True,
@@ -91,93 +232,207 @@ def read_csv_with_encoding_detection(csv_path, expected_columns=2):
     }
 
 
-def generate_copy_name(original_path):
-    """生成副本名称"""
+def _new_operation_id():
+    """生成操作ID
+
+    直接取 16 字节系统随机数转为十六进制（与 secrets.token_hex(16) 相同），
+    不需要导入 uuid 模块，也不用构造 UUID 对象。
+    """
+    return os.urandom(16).hex()
+
+
+def _ensure_dir(directory):
+    """确保目录存在，同一操作内对同一目录只调用一次 os.makedirs
+    Args:
+        directory: 目录路径
+    """
+    if not directory or directory in _ensured_dirs:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _ensured_dirs.add(directory)
+
+
+def generate_copy_name(original_path, pending=None, counters=None):
+    """生成副本名称
+    Args:
+        original_path: 原始路径
+        pending: 本次操作中已规划、尚未写入磁盘的路径集合（视为已存在）
+        counters: 本次操作的副本编号缓存，(目录, 文件名, 扩展名) -> 下一个待尝试的编号；
+            同一目录大量冲突时不必每次从1开始探测。为None时总是从1开始
+    """
     directory = os.path.dirname(original_path)
     filename = os.path.basename(original_path)
     name, ext = os.path.splitext(filename)
 
-    # 查找可用的副本编号
-    counter = 1
+    # 查找可用的副本编号（从本次操作上次分配的编号之后开始）
+    cache_key = (directory, name, ext)
+    counter = counters.get(cache_key, 1) if counters is not None else 1
     while True:
         new_name = f"{name}_副本{counter}{ext}"
         new_path = os.path.join(directory, new_name)
-        if not os.path.exists(new_path):
+        if not os.path.lexists(new_path) and (pending is None or new_path not in pending):
+            if counters is not None:
+                counters[cache_key] = counter + 1
             return new_path
         counter += 1
 
 
-def resolve_conflict(source_path, target_path, conflict_mode, is_folder=False):
+def _is_same_path(source_path, target_path, move=False):
+    """判断目标是否与源是同一个文件/文件夹
+    Args:
+        source_path: 源路径
+        target_path: 目标路径
+        move: 是否为剪切/重命名。此时只有路径完全相同才算同一个：大小写不敏感的文件系统上
+            只差大小写的两个路径指向同一个文件，而重命名正是要改变大小写
+    Returns:
+        复制时比较 st_dev 和 st_ino，剪切/重命名时比较绝对路径
+    """
+    if move:
+        return os.path.abspath(source_path) == os.path.abspath(target_path)
+    try:
+        return os.path.samefile(source_path, target_path)
+    except OSError:
+        # 目标只是本次操作中规划的路径、尚未写入磁盘
+        return False
+
+
+def resolve_conflict(source_path, target_path, conflict_mode, is_folder=False, pending=None,
+                     counters=None, move=False):
     """统一的冲突解决方案
     Args:
         source_path: 源文件/文件夹路径
         target_path: 目标文件/文件夹路径
         conflict_mode: 冲突处理模式 ("skip", "overwrite", "copy", "merge")
         is_folder: 是否为文件夹
+        pending: 本次操作中已规划、尚未写入磁盘的路径集合（视为已存在）
+        counters: 本次操作的副本编号缓存，见 generate_copy_name
+        move: 是否为剪切/重命名（源会被移走，而不是复制）
     Returns:
         处理后的目标路径，或None表示跳过
     """
-    if not os.path.exists(target_path):
+    if not os.path.exists(target_path) and (pending is None or target_path not in pending):
         return target_path  # 无冲突
 
-    print(f"  检测到冲突: {target_path} 已存在")
+    log.info("  检测到冲突: %s 已存在", target_path)
 
     if conflict_mode == "skip":
-        print(f"  跳过冲突文件: {target_path}")
+        log.info("  跳过冲突文件: %s", target_path)
+        return None
+
+    elif conflict_mode in ("overwrite", "merge") and _is_same_path(source_path, target_path, move):
+        # 目标就是源本身，覆盖/合并不会产生任何变化，直接跳过而不是白白复制一遍
+        log.info("  目标与源相同，跳过: %s", target_path)
         return None
 
     elif conflict_mode == "overwrite":
-        print(f"  覆盖现有文件: {target_path}")
+        log.info("  覆盖现有文件: %s", target_path)
         return target_path
 
     elif conflict_mode == "copy":
-        new_path = generate_copy_name(target_path)
-        print(f"  创建副本: {target_path} -> {new_path}")
+        new_path = generate_copy_name(target_path, pending, counters)
+        log.info("  创建副本: %s -> %s", target_path, new_path)
         return new_path
 
     elif conflict_mode == "merge" and is_folder:
-        print(f"  合并文件夹内容: {source_path} -> {target_path}")
+        log.info("  合并文件夹内容: %s -> %s", source_path, target_path)
         return target_path
 
     else:
         # 默认处理：创建副本
-        new_path = generate_copy_name(target_path)
-        print(f"  创建副本: {target_path} -> {new_path}")
+        new_path = generate_copy_name(target_path, pending, counters)
+        log.info("  创建副本: %s -> %s", target_path, new_path)
         return new_path
 
 
+def _copy_file_range(source_path, target_path):
+    """使用 os.copy_file_range 复制文件内容
+    Args:
+        source_path: 源文件路径
+        target_path: 目标文件路径
+    Returns:
+        是否已完成复制；返回 False 表示当前文件不适用，需要改用其他方式复制
+    """
+    source_stat = os.stat(source_path)
+    # 空文件、管道等特殊文件交给 shutil 处理
+    if not stat.S_ISREG(source_stat.st_mode) or source_stat.st_size == 0:
+        return False
+
+    src_fd = os.open(source_path, os.O_RDONLY)
+    try:
+        dst_fd = os.open(target_path, os.O_WRONLY | os.O_CREAT, 0o666)
+        try:
+            target_stat = os.fstat(dst_fd)
+            if (target_stat.st_dev, target_stat.st_ino) == (source_stat.st_dev, source_stat.st_ino):
+                raise shutil.SameFileError(f"{source_path} 和 {target_path} 是同一个文件")
+            os.ftruncate(dst_fd, 0)
+
+            blocksize = min(max(source_stat.st_size, 8 * 1024 * 1024), 1024 * 1024 * 1024)
+            copied = 0
+            while True:
+                try:
+                    n = os.copy_file_range(src_fd, dst_fd, blocksize)
+                except OSError:
+                    # 内核或文件系统不支持（跨设备、ENOSYS 等），尚未写入数据时改用其他方式
+                    if copied == 0:
+                        return False
+                    raise
+                if n == 0:
+                    # 部分虚拟文件系统的文件大小不可靠，一个字节都没复制时改用其他方式
+                    return copied > 0
+                copied += n
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _fast_copy(source_path, target_path):
+    """复制文件内容和元数据，效果与 shutil.copy2 相同
+
+    Linux 上优先使用 os.copy_file_range，数据不经过用户态缓冲；
+    其他平台或不支持时使用 shutil.copyfile（已内置 sendfile/fcopyfile 等快速路径）。
+
+    Args:
+        source_path: 源文件路径
+        target_path: 目标文件路径
+    Returns:
+        目标文件路径
+    """
+    if not (_HAS_COPY_FILE_RANGE and _copy_file_range(source_path, target_path)):
+        shutil.copyfile(source_path, target_path)
+    shutil.copystat(source_path, target_path)
+    return target_path
+
+
 def merge_folders(source_folder, target_folder):
     """合并文件夹内容
     Args:
         source_folder: 源文件夹路径
         target_folder: 目标文件夹路径
     """
+
+    def copy_or_create_copy(source_item, target_item):
+        if os.path.lexists(target_item):
+            # 文件冲突，创建副本
+            new_path = generate_copy_name(target_item)
+            _fast_copy(source_item, new_path)
+            log.info("    文件冲突，创建副本: %s -> %s", target_item, new_path)
+            return new_path
+        return _fast_copy(source_item, target_item)
+
     try:
-        # 遍历源文件夹中的所有内容
-        for item in os.listdir(source_folder):
-            source_item = os.path.join(source_folder, item)
-            target_item = os.path.join(target_folder, item)
-
-            if os.path.isdir(source_item):
-                # 如果是文件夹，递归合并
-                if not os.path.exists(target_item):
-                    shutil.copytree(source_item, target_item)
-                else:
-                    merge_folders(source_item, target_item)
-            else:
-                # 如果是文件，复制到目标文件夹
-                if not os.path.exists(target_item):
-                    shutil.copy2(source_item, target_item)
-                else:
-                    # 文件冲突，创建副本
-                    new_path = generate_copy_name(target_item)
-                    shutil.copy2(source_item, new_path)
-                    print(f"    文件冲突，创建副本: {target_item} -> {new_path}")
+        # 已存在的子文件夹直接合并，文件冲突时创建副本
+        shutil.copytree(
+            source_folder,
+            target_folder,
+            copy_function=copy_or_create_copy,
+            dirs_exist_ok=True,
+        )
 
-        print(f"  文件夹合并完成: {source_folder} -> {target_folder}")
+        log.debug("  文件夹合并完成: %s -> %s", source_folder, target_folder)
 
     except Exception as e:
-        print(f"  合并文件夹失败: {e}")
+        log.error("  合并文件夹失败: %s", e)
         raise e
 
 def create_ignore_function(exclude_pattern):
@@ -212,12 +467,431 @@ def create_ignore_function(exclude_pattern):
     
     return ignore_func
 
-def search_and_copy_files(source, target, csv_file, cut_mode=False, conflict_mode=None):
-    """搜索并复制/剪切匹配的文件"""
+def _copy_folder(source_folder, target_folder, conflict_mode, ignore_func=None):
+    """复制整个文件夹，覆盖模式下先删除已存在的目标文件夹
+    Args:
+        source_folder: 源文件夹路径
+        target_folder: 目标文件夹路径（副本模式下已是副本路径）
+        conflict_mode: 冲突处理模式
+        ignore_func: 传给 shutil.copytree 的忽略函数
+    """
+    if conflict_mode == "overwrite" and os.path.exists(target_folder):
+        # 覆盖模式：先删除现有文件夹
+        shutil.rmtree(target_folder)
+    shutil.copytree(source_folder, target_folder, ignore=ignore_func, copy_function=_fast_copy)
+
+
+def _run_parallel(tasks, max_workers=None):
+    """并发执行互相独立的复制任务
+
+    复制的耗时主要在系统调用上，shutil/os 在阻塞调用期间会释放GIL，
+    因此用线程池即可让多个复制同时进行。目标路径相同的任务按原顺序
+    串行执行，保证与逐个执行的结果一致。
+
+    Args:
+        tasks: [(目标路径, 无参可调用对象)] 列表
+        max_workers: 最大并发线程数，默认 min(32, 任务数)
+    Returns:
+        list: 与 tasks 一一对应的异常对象，成功的任务为 None
+    """
+    errors = [None] * len(tasks)
+    if not tasks:
+        return errors
+
+    chains = {}
+    for index, (dest, func) in enumerate(tasks):
+        chains.setdefault(dest, []).append((index, func))
+
+    def run_chain(chain):
+        for position, (index, func) in enumerate(chain):
+            try:
+                func()
+            except Exception as e:
+                # 同一目标的后续任务依赖当前结果，一并标记为失败
+                for later_index, _ in chain[position:]:
+                    errors[later_index] = e
+                return
+
+    if max_workers is None:
+        max_workers = min(32, len(chains))
+
+    if max_workers <= 1 or len(chains) == 1:
+        for chain in chains.values():
+            run_chain(chain)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(run_chain, c) for c in chains.values()]:
+                future.result()
+
+    return errors
+
+
+def _copy_into(target_path, func):
+    """创建目标的父目录后执行复制任务
+
+    父目录在任务执行时才创建：规划阶段不改动磁盘，
+    后续行看到的仍是前面各行执行前的状态。
+    """
+    _ensure_dir(os.path.dirname(target_path))
+    func()
+
+
+def _path_key(path):
+    """用于比较的规范化绝对路径"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _is_within(key, keys):
+    """key 是否等于 keys 中的某个路径或位于其下"""
+    while key not in keys:
+        parent = os.path.dirname(key)
+        if parent == key:
+            return False
+        key = parent
+    return True
+
+
+def _add_path(key, keys, parents):
+    """把 key 加入 keys，并把它的所有上级目录加入 parents"""
+    keys.add(key)
+    parent = os.path.dirname(key)
+    while parent != key and parent not in parents:
+        parents.add(parent)
+        key, parent = parent, os.path.dirname(parent)
+
+
+class _MovedTargets:
+    """剪切/重命名操作中已移动到的目标路径
+
+    同一文件系统内直接重命名的行没有备份，撤回时把目标改回源路径。
+    后面的行再写入这些目标（覆盖同名文件、移动到同一文件夹中等）时，
+    目标里已不是原来的内容，撤回后面的行时还会删除目标，
+    所以先为这些行补上备份，后面的行本身也保留备份。
+    撤回时按相反的顺序处理各行。
+    """
+
+    def __init__(self, backup_paths, backup_prefix):
+        """
+        Args:
+            backup_paths: 本次操作的备份路径列表，与源/目标路径一一对应，由 add 追加
+            backup_prefix: 备份文件路径前缀（备份目录加操作ID前缀）
+        """
+        self._backup_paths = backup_paths
+        self._backup_prefix = backup_prefix
+        self._backup_seq = itertools.count()
+        self._targets = set()
+        self._target_parents = set()
+        # 直接重命名、尚未补上备份的行：目标路径 -> (下标, 目标路径)
+        self._renamed = {}
+
+    def backup_path(self, source_path):
+        """生成下一个备份路径（前缀加递增序号，不必每个文件都生成随机数）"""
+        return f"{self._backup_prefix}{next(self._backup_seq)}_{os.path.basename(source_path)}"
+
+    def needs_backup(self, dest_path):
+        """移动到 dest_path 之前调用
+        Args:
+            dest_path: 即将写入的目标路径
+        Returns:
+            目标已存在，或与之前的目标相同、位于其下或包含它时返回 True；
+            此时与之重叠的直接重命名行已补上备份
+        """
+        key = _path_key(dest_path)
+        if key in self._target_parents:
+            prefix = os.path.join(key, "")
+            overlapping = [k for k in self._renamed if k.startswith(prefix)]
+        elif _is_within(key, self._targets):
+            overlapping = []
+            parent = key
+            while True:
+                if parent in self._renamed:
+                    overlapping.append(parent)
+                parent, key = os.path.dirname(parent), parent
+                if parent == key:
+                    break
+        else:
+            return os.path.lexists(dest_path)
+
+        for renamed_key in overlapping:
+            index, target_path = self._renamed.pop(renamed_key)
+            # 目标已被后面的行移走时，撤回这些行后目标会回到原处，无需备份
+            if os.path.lexists(target_path):
+                backup_path = self.backup_path(target_path)
+                _create_backup(target_path, backup_path)
+                self._backup_paths[index] = backup_path
+        return True
+
+    def add(self, dest_path, backup_path):
+        """记录已完成的移动，并把备份路径追加到 backup_paths"""
+        key = _path_key(dest_path)
+        _add_path(key, self._targets, self._target_parents)
+        if backup_path is None:
+            self._renamed[key] = (len(self._backup_paths), dest_path)
+        self._backup_paths.append(backup_path)
+
+
+class _CopyBatch:
+    """复制模式下已规划、尚未执行的复制任务
+
+    同一批次的任务并发执行。后续行的源路径与本批次的目标重叠，
+    或目标路径与本批次的源/目标重叠（相同、位于其下或包含它）时，
+    说明该行依赖前面的行，调用方应先执行完本批次再规划该行，
+    保证结果与逐行执行一致。
+
+    也可直接作为 resolve_conflict 的 pending 参数：本批次的目标及其上级目录视为已存在。
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._reset()
+
+    def _reset(self):
+        self._tasks = []
+        self._rows = []
+        self._targets = set()
+        self._target_parents = set()
+        self._sources = set()
+        self._source_parents = set()
+
+    def __bool__(self):
+        return bool(self._tasks)
+
+    def __contains__(self, path):
+        key = _path_key(path)
+        return key in self._targets or key in self._target_parents
+
+    def add(self, source_path, target_path, func, row):
+        """加入一个复制任务
+        Args:
+            source_path: 任务读取的源路径
+            target_path: 任务写入的目标路径
+            func: 无参可调用对象，执行实际复制
+            row: 调用方用于汇总结果的行信息
+        """
+        self._tasks.append((target_path, functools.partial(_copy_into, target_path, func)))
+        self._rows.append(row)
+        _add_path(_path_key(target_path), self._targets, self._target_parents)
+        _add_path(_path_key(source_path), self._sources, self._source_parents)
+
+    def writes(self, path):
+        """本批次是否会写入 path、其下级或上级路径"""
+        if not self._tasks:
+            return False
+        key = _path_key(path)
+        return key in self._target_parents or _is_within(key, self._targets)
+
+    def uses(self, path):
+        """本批次是否会读取或写入 path、其下级或上级路径"""
+        if not self._tasks:
+            return False
+        key = _path_key(path)
+        return (
+            key in self._target_parents
+            or key in self._source_parents
+            or _is_within(key, self._targets)
+            or _is_within(key, self._sources)
+        )
+
+    def run(self):
+        """并发执行本批次的任务并清空批次
+        Returns:
+            list: [(行信息, 异常或None)]，顺序与加入顺序一致
+        """
+        errors = _run_parallel(self._tasks, self.max_workers)
+        results = list(zip(self._rows, errors))
+        self._reset()
+        return results
+
+
+def _scan_tree(top):
+    """基于 os.scandir 自顶向下遍历目录树（遍历顺序与 os.walk 一致）
+
+    Args:
+        top: 根目录路径
+    Yields:
+        (目录路径, 子文件夹DirEntry列表, 文件DirEntry列表)
+        与 os.walk 相同，调用方可以原地修改子文件夹列表来跳过部分子树
+    """
+    stack = [top]
+    while stack:
+        current = stack.pop()
+        dirs = []
+        files = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    # DirEntry 复用 readdir 返回的类型信息，无需额外 stat
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        dirs.append(entry)
+                    else:
+                        files.append(entry)
+        except OSError:
+            # 与 os.walk 一致：无法访问的目录直接跳过
+            continue
+
+        yield current, dirs, files
+
+        # 逆序入栈，保证按目录顺序深度优先遍历；不跟随符号链接
+        for entry in reversed(dirs):
+            if not entry.is_symlink():
+                stack.append(entry.path)
+
+
+def _iter_files(top):
+    """遍历目录树中的所有文件
+    Yields:
+        (文件名, 完整路径)
+    """
+    for _, _, files in _scan_tree(top):
+        for entry in files:
+            yield entry.name, entry.path
+
+
+def _make_backup(source_path, backup_path):
+    """创建文件备份
+
+    备份目录与源文件在同一文件系统时使用硬链接，不复制任何数据；
+    源文件随后被移走，备份仍保留原来的内容和元数据。否则复制一份。
+
+    Args:
+        source_path: 源文件路径
+        backup_path: 备份文件路径
+    Returns:
+        备份文件路径
+    """
+    try:
+        os.link(source_path, backup_path)
+        return backup_path
+    except OSError:
+        return _fast_copy(source_path, backup_path)
+
+
+def _remove_path(path):
+    """删除文件或文件夹，直接尝试删除而不是先检查是否存在
+    Args:
+        path: 要删除的路径
+    Returns:
+        是否删除了内容；路径不存在时返回 False
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    except (IsADirectoryError, PermissionError):
+        # 对文件夹调用 os.remove：Linux 报 IsADirectoryError，Windows/macOS 报 PermissionError
+        if not os.path.isdir(path):
+            raise
+        shutil.rmtree(path)
+    return True
+
+
+def _try_replace(source_path, dest_path):
+    """尝试用一次 os.replace 完成移动
+    Args:
+        source_path: 源文件/文件夹路径
+        dest_path: 目标路径
+    Returns:
+        是否已移动；跨设备等无法直接重命名时返回 False
+    """
+    # 目标是已存在的文件夹时保持 shutil.move 的语义（移动到文件夹内），交给调用方处理
+    if os.path.isdir(dest_path):
+        return False
+    try:
+        os.replace(source_path, dest_path)
+        return True
+    except OSError:
+        return False
+
+
+def _fast_move(source_path, dest_path):
+    """移动文件/文件夹，同一文件系统内只需一次重命名，否则交给 shutil.move
+    Args:
+        source_path: 源文件/文件夹路径
+        dest_path: 目标路径
+    """
+    if not _try_replace(source_path, dest_path):
+        shutil.move(source_path, dest_path, copy_function=_fast_copy)
+
+
+def _move_back(path, source_path):
+    """撤回时把 path 移回源路径
+
+    源路径上可能有本次操作之后才创建的空文件夹（后面的行需要的目标上级目录），
+    先删除它，否则会被移动到这个文件夹里面。
+    """
+    _ensure_dir(os.path.dirname(source_path))
+    try:
+        os.rmdir(source_path)
+    except OSError:
+        pass
+    _fast_move(path, source_path)
+
+
+def _create_backup(source_path, backup_path):
+    """把文件/文件夹备份到 backup_path（备份目录只在确实需要物理备份时才创建）"""
+    _ensure_dir(os.path.dirname(backup_path))
+    log.debug("  正在创建备份: %s -> %s", source_path, backup_path)
+    if os.path.isdir(source_path):
+        shutil.copytree(source_path, backup_path, copy_function=_make_backup)
+    else:
+        _make_backup(source_path, backup_path)
+    log.debug("  备份创建成功: %s", backup_path)
+
+
+def _safe_move(source_path, dest_path, backup_path, keep_backup=False):
+    """剪切文件/文件夹，同一文件系统内直接重命名
+
+    同一文件系统内使用 os.replace（原子操作，不复制任何数据，Windows 上也能覆盖已有文件），
+    不需要物理备份，撤回时把目标重命名回源路径即可；
+    跨设备等无法直接重命名的情况，或调用方要求保留备份时（见 _MovedTargets），
+    先备份到临时位置再移动，失败时从备份恢复。
+
+    Args:
+        source_path: 源文件/文件夹路径
+        dest_path: 目标路径
+        backup_path: 需要物理备份时使用的备份路径
+        keep_backup: 是否总是创建物理备份
+    Returns:
+        实际创建的备份路径；直接重命名时返回 None
+    """
+    if not keep_backup and _try_replace(source_path, dest_path):
+        return None
+
+    # 1. 备份到临时位置
+    _create_backup(source_path, backup_path)
+
+    # 2. 移动文件/文件夹
+    try:
+        shutil.move(source_path, dest_path, copy_function=_fast_copy)
+    except Exception:
+        # 恢复备份
+        try:
+            shutil.move(backup_path, source_path)
+            log.warning("  移动失败，已从备份恢复到原位置")
+        except Exception as restore_error:
+            log.error("  恢复备份失败: %s", restore_error)
+            log.error("  备份文件位置: %s", backup_path)
+        raise
+
+    return backup_path
+
+
+def search_and_copy_files(source, target, csv_file, cut_mode=False, conflict_mode=None, max_workers=None, case_sensitive=False):
+    """搜索并复制/剪切匹配的文件
+
+    复制模式下按CSV顺序规划目标路径，互不依赖的复制并发执行；
+    某行用到前面尚未执行的行读写的路径时，先执行完这些行再继续规划。
+    剪切模式只涉及重命名，按顺序逐个执行。
+    """
     copied_files = []
     renamed_files = []
     backup_paths = []
     source_paths = []
+    batch = _CopyBatch(max_workers)
     temp_backup_dir = ".temp_backup"
     operation_success = False
     error_message = None
@@ -226,8 +900,15 @@ def search_and_copy_files(source, target, csv_file, cut_mode=False, conflict_mod
     if conflict_mode is None:
         conflict_mode = DEFAULT_CONFLICT_MODE
 
+    _ensured_dirs.clear()
+    copy_counters = {}
+
     # 生成操作ID
-    operation_id = str(uuid.uuid4())
+    operation_id = _new_operation_id()
+    # 记录剪切/重命名已移动到的目标，备份文件名使用操作ID前缀加递增序号
+    moved = _MovedTargets(
+        backup_paths, os.path.join(temp_backup_dir, f"backup_{operation_id[:8]}_")
+    )
     operation_type = "剪切" if cut_mode else "复制"
 
     try:
@@ -253,134 +934,127 @@ def search_and_copy_files(source, target, csv_file, cut_mode=False, conflict_mod
             f"CSV文件读取成功，使用编码: {csv_result['encoding']}，共 {csv_result['total_rows']} 行数据"
         )
 
-        os.makedirs(temp_backup_dir, exist_ok=True)
+        # 循环中频繁调用的函数先绑定到局部变量，减少全局名称和属性查找
+        join = os.path.join
+        dirname = os.path.dirname
+        basename = os.path.basename
+        exists = os.path.exists
+        copy_file = _fast_copy
+
+        # 一次遍历源目录，建立 文件名 -> 路径列表 的索引，只收录CSV中需要的文件
+        # 不区分大小写时每个文件名只做一次 casefold
+        fold = str if case_sensitive else str.casefold
+        wanted = {fold(item.source_name) for item in csv_result["data"]}
+        file_index = {}
+        for file, file_path in _iter_files(source):
+            key = fold(file)
+            if key in wanted:
+                file_index.setdefault(key, []).append(file_path)
+
+        def run_copy_batch():
+            """执行已规划的复制任务，结果按CSV顺序汇总；有任务失败时抛出第一个异常"""
+            first_error = None
+            for (source_file, resolved_path, file_name, target_name), error in batch.run():
+                if error is not None:
+                    log.error("  复制操作发生异常: %s -> %s: %s", source_file, resolved_path, error)
+                    if first_error is None:
+                        first_error = error
+                    continue
+
+                copied_files.append(resolved_path)
+                source_paths.append(source_file)
+                log.debug("  复制成功: 文件已复制到 %s", resolved_path)
+
+                # 如果目标名称与原名称不同，记录重命名信息
+                if target_name != file_name:
+                    renamed_files.append((file_name, target_name))
+
+            if first_error is not None:
+                raise first_error
 
         # 处理CSV数据
         for item in csv_result["data"]:
-            file_name = item["source_name"]
-            target_name = item["target_name"]
+            file_name = item.source_name
+            target_name = item.target_name
 
-            print(f"正在搜索文件: {file_name} -> {target_name} ({operation_type}模式)")
+            log.info("正在搜索文件: %s -> %s (%s模式)", file_name, target_name, operation_type)
 
-            # 遍历source目录
-            found = False
-            for root, dirs, files in os.walk(source):
-                for file in files:
-                    if file.lower() == file_name.lower():
-                        # 构建源文件路径和目标文件路径
-                        source_file = os.path.join(root, file)
-                        dest_file = os.path.join(target, target_name)
+            matches = file_index.get(fold(file_name))
+            if not matches:
+                log.warning("  警告: 文件 '%s' 在源路径中未找到", file_name)
+                continue
+            source_file = matches[0]
 
-                        print(f"  找到: {source_file}")
-                        print(f"  正在{operation_type}到: {dest_file}")
+            # 构建目标文件路径
+            dest_file = join(target, target_name)
 
-                        # 确保目标目录存在
-                        os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+            log.debug("  找到: %s", source_file)
+            log.debug("  正在%s到: %s", operation_type, dest_file)
 
-                        # 处理冲突
-                        resolved_path = resolve_conflict(
-                            source_file, dest_file, conflict_mode, is_folder=False
-                        )
-                        if resolved_path is None:
-                            print(f"  跳过文件: {dest_file}")
-                            continue
-
-                        if cut_mode:
-                            # 剪切模式：先备份再移动
-                            temp_backup = os.path.join(
-                                temp_backup_dir,
-                                f"backup_{os.path.basename(source_file)}_{os.urandom(4).hex()}",
-                            )
-                            try:
-                                # 检查源文件是否存在
-                                if not os.path.exists(source_file):
-                                    print(f"  警告: 源文件不存在: {source_file}")
-                                    continue
-
-                                # 1. 备份到临时位置
-                                print(f"  正在创建备份: {source_file} -> {temp_backup}")
-                                shutil.copy2(source_file, temp_backup)
-                                print(f"  备份创建成功: {temp_backup}")
-                                backup_paths.append(temp_backup)
-                                source_paths.append(source_file)
-
-                                # 2. 移动文件
-                                print(
-                                    f"  正在移动文件: {source_file} -> {resolved_path}"
-                                )
-                                shutil.move(source_file, resolved_path)
-                                copied_files.append(resolved_path)
-
-                                # 验证移动是否成功
-                                if os.path.exists(resolved_path) and not os.path.exists(
-                                    source_file
-                                ):
-                                    print(
-                                        f"  {operation_type}成功: 文件已移动到 {resolved_path}"
-                                    )
-                                else:
-                                    print(f"  警告: {operation_type}操作可能未完全成功")
-                                    print(
-                                        f"  源文件存在: {os.path.exists(source_file)}"
-                                    )
-                                    print(
-                                        f"  目标文件存在: {os.path.exists(resolved_path)}"
-                                    )
-
-                            except Exception as e:
-                                print(f"  {operation_type}操作发生异常: {e}")
-                                # 恢复备份
-                                if os.path.exists(temp_backup):
-                                    try:
-                                        shutil.move(temp_backup, source_file)
-                                        print(
-                                            f"  {operation_type}失败，已从备份恢复文件到原位置"
-                                        )
-                                    except Exception as restore_error:
-                                        print(f"  恢复备份失败: {restore_error}")
-                                        print(f"  备份文件位置: {temp_backup}")
-                                else:
-                                    print(f"  备份文件不存在，无法恢复: {temp_backup}")
-                                raise e
+            # 与前面尚未执行的行读写的路径重叠（如目标目录就是源目录）：先执行完这些行
+            if batch.writes(source_file) or batch.uses(dest_file):
+                run_copy_batch()
 
-                        else:
-                            # 复制模式
-                            try:
-                                # 如果目标路径已更改（创建了副本），需要确保目标目录存在
-                                if resolved_path != dest_file:
-                                    os.makedirs(
-                                        os.path.dirname(resolved_path),
-                                        exist_ok=True,
-                                    )
-
-                                shutil.copy2(source_file, resolved_path)
-                                copied_files.append(resolved_path)
-                                source_paths.append(source_file)
-                                print(f"  复制成功: 文件已复制到 {resolved_path}")
-                            except Exception as e:
-                                print(f"  复制操作发生异常: {e}")
-                                raise e
-
-                        # 如果目标名称与原名称不同，记录重命名信息
-                        if target_name != file_name:
-                            renamed_files.append((file_name, target_name))
-
-                        found = True
-                        break
-                if found:
-                    break
+            # 处理冲突
+            resolved_path = resolve_conflict(
+                source_file, dest_file, conflict_mode, is_folder=False, pending=batch,
+                counters=copy_counters, move=cut_mode
+            )
+            if resolved_path is None:
+                log.info("  跳过文件: %s", dest_file)
+                continue
 
-            if not found:
-                print(f"  警告: 文件 '{file_name}' 在源路径中未找到")
+            if cut_mode:
+                # 剪切模式：同一文件系统内直接重命名，否则先备份再移动
+                temp_backup = moved.backup_path(source_file)
+                try:
+                    # 检查源文件是否存在
+                    if not exists(source_file):
+                        log.warning("  警告: 源文件不存在: %s", source_file)
+                        continue
+
+                    # 确保目标目录存在
+                    _ensure_dir(dirname(resolved_path))
+
+                    log.debug("  正在移动文件: %s -> %s", source_file, resolved_path)
+                    backup_path = _safe_move(
+                        source_file, resolved_path, temp_backup, moved.needs_backup(resolved_path)
+                    )
+                    moved.add(resolved_path, backup_path)
+                    source_paths.append(source_file)
+                    copied_files.append(resolved_path)
+                    log.debug("  %s成功: 文件已移动到 %s", operation_type, resolved_path)
+
+                except Exception as e:
+                    log.error("  %s操作发生异常: %s", operation_type, e)
+                    raise e
+
+            else:
+                # 复制模式：只记录复制任务，与同一批次的其他任务并发执行
+                batch.add(
+                    source_file,
+                    resolved_path,
+                    functools.partial(copy_file, source_file, resolved_path),
+                    (source_file, resolved_path, file_name, target_name),
+                )
+                continue
+
+            # 如果目标名称与原名称不同，记录重命名信息
+            if target_name != file_name:
+                renamed_files.append((file_name, target_name))
+
+        # 并发执行剩余的复制任务
+        run_copy_batch()
 
         operation_success = True
 
     except Exception as e:
         error_message = str(e)
-        print(f"搜索并复制文件操作失败: {e}")
+        log.error("搜索并复制文件操作失败: %s", e)
         operation_success = False
 
     finally:
+        _flush_log()
         # 无论操作是否成功，都保存操作历史记录
         save_operation_history(
             operation_type=operation_type,
@@ -431,8 +1105,15 @@ def rename_files_in_place(source, csv_file, conflict_mode=None):
     if conflict_mode is None:
         conflict_mode = DEFAULT_CONFLICT_MODE
 
+    _ensured_dirs.clear()
+    copy_counters = {}
+
     # 生成操作ID
-    operation_id = str(uuid.uuid4())
+    operation_id = _new_operation_id()
+    # 记录剪切/重命名已移动到的目标，备份文件名使用操作ID前缀加递增序号
+    moved = _MovedTargets(
+        backup_paths, os.path.join(temp_backup_dir, f"backup_{operation_id[:8]}_")
+    )
     operation_type = "重命名"
 
     try:
@@ -449,119 +1130,86 @@ def rename_files_in_place(source, csv_file, conflict_mode=None):
             f"CSV文件读取成功，使用编码: {csv_result['encoding']}，共 {csv_result['total_rows']} 行数据"
         )
 
-        os.makedirs(temp_backup_dir, exist_ok=True)
+        # 循环中频繁调用的函数先绑定到局部变量，减少全局名称和属性查找
+        join = os.path.join
+        dirname = os.path.dirname
+        basename = os.path.basename
+        exists = os.path.exists
+        isfile = os.path.isfile
 
-        # 检测重复的源路径
-        source_path_counts = {}
+        # 按源路径分组（保持在CSV中首次出现的顺序），重复的源路径只处理一次
+        targets_by_source = collections.defaultdict(list)
         for item in csv_result["data"]:
-            source_path = item["source_name"].strip()
-            target_path = item["target_name"].strip()
-            
-            if source_path in source_path_counts:
-                source_path_counts[source_path].append(target_path)
-            else:
-                source_path_counts[source_path] = [target_path]
+            targets_by_source[item.source_name.strip()].append(item.target_name.strip())
 
         # 处理CSV数据
-        processed_files = set()  # 记录已处理的源路径
-        for item in csv_result["data"]:
-            source_path = item["source_name"].strip()
-            target_path = item["target_name"].strip()
-
-            print(f"正在处理: {source_path} -> {target_path}")
+        for source_path, targets in targets_by_source.items():
+            target_path = targets[0]
 
-            # 检查源路径是否已处理过
-            if source_path in processed_files:
-                print(f"  警告: 源路径 '{source_path}' 已处理过，跳过重复项")
-                continue
+            log.info("正在处理: %s -> %s", source_path, target_path)
 
-            # 检查源路径是否重复且目标路径不同
-            if len(source_path_counts[source_path]) > 1:
-                target_paths = source_path_counts[source_path]
-                if len(set(target_paths)) > 1:
-                    print(f"  警告: 源路径 '{source_path}' 在CSV中出现多次且目标路径不同，跳过该文件")
-                    print(f"  目标路径列表: {target_paths}")
-                    processed_files.add(source_path)
+            # 检查源路径是否重复
+            if len(targets) > 1:
+                if len(set(targets)) > 1:
+                    log.warning("  警告: 源路径 '%s' 在CSV中出现多次且目标路径不同，跳过该文件", source_path)
+                    log.warning("  目标路径列表: %s", targets)
                     continue
+                log.warning("  警告: 源路径 '%s' 在CSV中出现 %s 次，跳过重复项", source_path, len(targets))
 
             # 检查源文件是否存在
-            if not os.path.exists(source_path):
-                print(f"  警告: 源文件不存在: {source_path}")
+            if not exists(source_path):
+                log.warning("  警告: 源文件不存在: %s", source_path)
                 continue
 
-            if not os.path.isfile(source_path):
-                print(f"  警告: 源路径不是文件: {source_path}")
+            if not isfile(source_path):
+                log.warning("  警告: 源路径不是文件: %s", source_path)
                 continue
 
             # 确保目标目录存在
-            target_dir = os.path.dirname(target_path)
-            os.makedirs(target_dir, exist_ok=True)
+            target_dir = dirname(target_path)
+            _ensure_dir(target_dir)
 
-            print(f"  源文件: {source_path}")
-            print(f"  目标文件: {target_path}")
+            log.debug("  源文件: %s", source_path)
+            log.debug("  目标文件: %s", target_path)
 
             # 处理冲突
             resolved_path = resolve_conflict(
-                source_path, target_path, conflict_mode, is_folder=False
+                source_path, target_path, conflict_mode, is_folder=False,
+                counters=copy_counters, move=True
             )
             if resolved_path is None:
-                print(f"  跳过文件: {target_path}")
-                processed_files.add(source_path)
+                log.info("  跳过文件: %s", target_path)
                 continue
 
-            # 重命名模式：先备份再重命名
-            temp_backup = os.path.join(
-                temp_backup_dir,
-                f"backup_{os.path.basename(source_path)}_{os.urandom(4).hex()}",
-            )
+            # 重命名模式：同一文件系统内直接重命名，否则先备份再移动
+            temp_backup = moved.backup_path(source_path)
             try:
-                # 1. 备份到临时位置
-                print(f"  正在创建备份: {source_path} -> {temp_backup}")
-                shutil.copy2(source_path, temp_backup)
-                print(f"  备份创建成功: {temp_backup}")
-                backup_paths.append(temp_backup)
+                log.debug("  正在重命名文件: %s -> %s", source_path, resolved_path)
+                backup_path = _safe_move(
+                    source_path, resolved_path, temp_backup, moved.needs_backup(resolved_path)
+                )
+                moved.add(resolved_path, backup_path)
                 source_paths.append(source_path)
-
-                # 2. 重命名文件
-                print(f"  正在重命名文件: {source_path} -> {resolved_path}")
-                shutil.move(source_path, resolved_path)
-
-                # 验证重命名是否成功
-                if os.path.exists(resolved_path) and not os.path.exists(source_path):
-                    print(f"  重命名成功: 文件已重命名为 {resolved_path}")
-                else:
-                    print(f"  警告: 重命名操作可能未完全成功")
-                    print(f"  源文件存在: {os.path.exists(source_path)}")
-                    print(f"  目标文件存在: {os.path.exists(resolved_path)}")
+                log.debug("  重命名成功: 文件已重命名为 %s", resolved_path)
 
             except Exception as e:
-                print(f"  重命名操作发生异常: {e}")
-                # 恢复备份
-                if os.path.exists(temp_backup):
-                    try:
-                        shutil.move(temp_backup, source_path)
-                        print(f"  重命名失败，已从备份恢复文件到原位置")
-                    except Exception as restore_error:
-                        print(f"  恢复备份失败: {restore_error}")
-                        print(f"  备份文件位置: {temp_backup}")
-                else:
-                    print(f"  备份文件不存在，无法恢复: {temp_backup}")
+                log.error("  重命名操作发生异常: %s", e)
                 raise e
 
             # 记录重命名信息
-            old_name = os.path.basename(source_path)
-            new_name = os.path.basename(resolved_path)
+            old_name = basename(source_path)
+            new_name = basename(resolved_path)
             renamed_files.append((old_name, new_name, source_path, resolved_path))
-            processed_files.add(source_path)
 
         operation_success = True
 
     except Exception as e:
         error_message = str(e)
-        print(f"重命名文件操作失败: {e}")
+        log.error("重命名文件操作失败: %s", e)
         operation_success = False
 
     finally:
+        _flush_log()
         # 无论操作是否成功，都保存操作历史记录
         target_paths = [target for _, _, _, target in renamed_files]
         save_operation_history(
@@ -598,7 +1246,7 @@ def rename_files_in_place(source, csv_file, conflict_mode=None):
     return renamed_files
 
 
-def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mode=None, exclude_pattern=None):
+def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mode=None, exclude_pattern=None, max_workers=None, case_sensitive=False):
     """提取整个文件夹到指定目录（支持遍历文件树）
     
     Args:
@@ -608,11 +1256,14 @@ def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mod
         cut_mode: 是否为剪切模式
         conflict_mode: 冲突处理模式
         exclude_pattern: 正则表达式模式，用于排除匹配的文件/文件夹名称
+        max_workers: 复制模式下的最大并发线程数（每个文件夹一个任务）
+        case_sensitive: 文件夹名匹配是否区分大小写（默认不区分）
     """
     copied_folders = []
     renamed_files = []
     backup_paths = []
     source_paths = []
+    batch = _CopyBatch(max_workers)
     temp_backup_dir = ".temp_backup"
     operation_success = False
     error_message = None
@@ -621,8 +1272,15 @@ def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mod
     if conflict_mode is None:
         conflict_mode = DEFAULT_CONFLICT_MODE
 
+    _ensured_dirs.clear()
+    copy_counters = {}
+
     # 生成操作ID
-    operation_id = str(uuid.uuid4())
+    operation_id = _new_operation_id()
+    # 记录剪切/重命名已移动到的目标，备份文件名使用操作ID前缀加递增序号
+    moved = _MovedTargets(
+        backup_paths, os.path.join(temp_backup_dir, f"backup_{operation_id[:8]}_")
+    )
     operation_type = "剪切" if cut_mode else "复制"
 
     try:
@@ -651,36 +1309,69 @@ def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mod
             f"CSV文件读取成功，使用编码: {csv_result['encoding']}，共 {csv_result['total_rows']} 行数据"
         )
 
-        os.makedirs(temp_backup_dir, exist_ok=True)
+        # 循环中频繁调用的函数先绑定到局部变量，减少全局名称和属性查找
+        join = os.path.join
+        dirname = os.path.dirname
+        basename = os.path.basename
+        exists = os.path.exists
 
         # 处理CSV数据
         folder_targets = []
         for item in csv_result["data"]:
-            folder_name = item["source_name"]
-            target_name = item["target_name"]
+            folder_name = item.source_name
+            target_name = item.target_name
             folder_targets.append((folder_name, target_name))
 
-            print(
-                f"正在搜索文件夹: {folder_name} -> {target_name} ({operation_type}模式)"
-            )
+            log.info("正在搜索文件夹: %s -> %s (%s模式)", folder_name, target_name, operation_type)
 
         # 遍历整个源目录树来查找文件夹
+        # 文件夹名 -> (CSV中的文件夹名, 目标名)，同名时以CSV中第一次出现的为准
+        fold = str if case_sensitive else str.casefold
+        target_map = {}
+        for folder_name, target_name in folder_targets:
+            target_map.setdefault(fold(folder_name), (folder_name, target_name))
+
         found_folders = {}
-        for root, dirs, files in os.walk(source):
-            for dir_name in dirs:
-                # 检查当前目录是否在要搜索的文件夹列表中
-                for folder_name, target_name in folder_targets:
-                    if dir_name.lower() == folder_name.lower():
-                        source_folder = os.path.join(root, dir_name)
-                        # 构建目标路径（直接放在目标目录下，不保持相对路径）
-                        dest_path = os.path.join(target, target_name)
-
-                        found_folders[source_folder] = (
-                            folder_name,
-                            target_name,
-                            dest_path,
-                        )
-                        break
+        for _, dirs, _ in _scan_tree(source):
+            unmatched = []
+            for entry in dirs:
+                # 不在CSV中的文件夹继续向下查找
+                match = target_map.get(fold(entry.name))
+                if match is None:
+                    unmatched.append(entry)
+                    continue
+                folder_name, target_name = match
+
+                # 构建目标路径（直接放在目标目录下，不保持相对路径）
+                found_folders[entry.path] = (
+                    folder_name,
+                    target_name,
+                    join(target, target_name),
+                )
+
+            # 匹配到的文件夹整体提取，不再进入其内部查找
+            dirs[:] = unmatched
+
+        def run_copy_batch():
+            """执行已规划的复制任务，结果按遍历顺序汇总；有任务失败时抛出第一个异常"""
+            first_error = None
+            for (source_folder, resolved_path, folder_name, target_name), error in batch.run():
+                if error is not None:
+                    log.error("  %s操作失败: %s -> %s: %s", operation_type, source_folder, resolved_path, error)
+                    if first_error is None:
+                        first_error = error
+                    continue
+
+                copied_folders.append(resolved_path)
+                source_paths.append(source_folder)
+                log.debug("  %s成功: %s", operation_type, resolved_path)
+
+                # 如果目标名称与原名称不同，记录重命名信息
+                if target_name != folder_name:
+                    renamed_files.append((folder_name, target_name))
+
+            if first_error is not None:
+                raise first_error
 
         # 处理找到的文件夹
         for source_folder, (
@@ -688,92 +1379,80 @@ def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mod
             target_name,
             dest_path,
         ) in found_folders.items():
-            print(f"  找到: {source_folder}")
-            print(f"  正在{operation_type}到: {dest_path}")
+            log.debug("  找到: %s", source_folder)
+            log.debug("  正在%s到: %s", operation_type, dest_path)
 
-            # 确保目标目录的父目录存在
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            # 与前面尚未执行的行读写的路径重叠（如目标名包含子目录）：先执行完这些行
+            if batch.writes(source_folder) or batch.uses(dest_path):
+                run_copy_batch()
 
             # 处理冲突
             resolved_path = resolve_conflict(
-                source_folder, dest_path, conflict_mode, is_folder=True
+                source_folder, dest_path, conflict_mode, is_folder=True, pending=batch,
+                counters=copy_counters, move=cut_mode
             )
             if resolved_path is None:
-                print(f"  跳过文件夹: {dest_path}")
+                log.info("  跳过文件夹: %s", dest_path)
                 continue
 
             if cut_mode:
-                # 剪切模式：先备份再移动
-                temp_backup = os.path.join(
-                    temp_backup_dir,
-                    f"backup_{os.path.basename(source_folder)}_{os.urandom(4).hex()}",
-                )
+                # 剪切模式：同一文件系统内直接重命名整个文件夹，否则先备份再移动
+                temp_backup = moved.backup_path(source_folder)
                 try:
-                    # 1. 备份到临时位置
-                    shutil.copytree(source_folder, temp_backup)
-                    print(f"  已创建备份: {temp_backup}")
-                    backup_paths.append(temp_backup)
-                    source_paths.append(source_folder)
+                    # 确保目标目录的父目录存在
+                    _ensure_dir(dirname(resolved_path))
 
-                    # 2. 移动文件夹
-                    print(f"  正在移动文件夹: {source_folder} -> {resolved_path}")
-                    shutil.move(source_folder, resolved_path)
+                    log.debug("  正在移动文件夹: %s -> %s", source_folder, resolved_path)
+                    backup_path = _safe_move(
+                        source_folder, resolved_path, temp_backup, moved.needs_backup(resolved_path)
+                    )
+                    moved.add(resolved_path, backup_path)
+                    source_paths.append(source_folder)
                     copied_folders.append(resolved_path)
 
-                    print(f"  {operation_type}成功")
+                    log.debug("  %s成功", operation_type)
 
                 except Exception as e:
-                    # 恢复备份
-                    if os.path.exists(temp_backup):
-                        try:
-                            shutil.move(temp_backup, source_folder)
-                            print(f"  {operation_type}失败，已从备份恢复文件夹")
-                        except Exception as restore_error:
-                            print(f"  恢复备份失败: {restore_error}")
+                    log.error("  %s操作发生异常: %s", operation_type, e)
                     raise e
 
             else:
-                # 复制模式
-                try:
-                    if conflict_mode == "merge" and os.path.exists(resolved_path):
-                        # 合并模式：合并文件夹内容（不应用排除模式）
-                        print(
-                            f"  正在合并文件夹内容: {source_folder} -> {resolved_path}"
-                        )
-                        merge_folders(source_folder, resolved_path)
-                    else:
-                        # 其他模式：复制文件夹，应用排除模式
-                        if (
-                            os.path.exists(resolved_path)
-                            and conflict_mode == "overwrite"
-                        ):
-                            # 覆盖模式：先删除现有文件夹
-                            shutil.rmtree(resolved_path)
-                        elif os.path.exists(resolved_path) and conflict_mode == "copy":
-                            # 副本模式：resolved_path已经是副本路径，直接复制
-                            pass
-
-                        shutil.copytree(source_folder, resolved_path, ignore=ignore_func)
+                # 复制模式：只记录复制任务，与同一批次的其他任务并发执行
+                if conflict_mode == "merge" and (
+                    exists(resolved_path) or resolved_path in batch
+                ):
+                    # 合并模式：合并文件夹内容（不应用排除模式）
+                    log.debug("  正在合并文件夹内容: %s -> %s", source_folder, resolved_path)
+                    task = functools.partial(merge_folders, source_folder, resolved_path)
+                else:
+                    # 其他模式：复制文件夹，应用排除模式
+                    # 副本模式下 resolved_path 已经是副本路径，直接复制
+                    task = functools.partial(
+                        _copy_folder, source_folder, resolved_path, conflict_mode, ignore_func
+                    )
 
-                    copied_folders.append(resolved_path)
-                    source_paths.append(source_folder)
-                    print(f"  {operation_type}成功")
-                except Exception as e:
-                    print(f"  {operation_type}操作失败: {e}")
-                    raise e
+                batch.add(
+                    source_folder, resolved_path, task,
+                    (source_folder, resolved_path, folder_name, target_name),
+                )
+                continue
 
             # 如果目标名称与原名称不同，记录重命名信息
             if target_name != folder_name:
                 renamed_files.append((folder_name, target_name))
 
+        # 并发执行剩余的复制任务
+        run_copy_batch()
+
         operation_success = True
 
     except Exception as e:
         error_message = str(e)
-        print(f"提取文件夹操作失败: {e}")
+        log.error("提取文件夹操作失败: %s", e)
         operation_success = False
 
     finally:
+        _flush_log()
         # 无论操作是否成功，都保存操作历史记录
         save_operation_history(
             operation_type=operation_type,
@@ -789,7 +1468,7 @@ def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mod
     found_folder_names = {name for name, _, _ in found_folders.values()}
     for folder_name, target_name in folder_targets:
         if folder_name not in found_folder_names:
-            print(f"  警告: 文件夹 '{folder_name}' 在源路径中未找到")
+            log.warning("  警告: 文件夹 '%s' 在源路径中未找到", folder_name)
 
     # 输出重命名信息
     if renamed_files:
@@ -811,17 +1490,19 @@ def extract_entire_folder(source, target, csv_file, cut_mode=False, conflict_mod
     return copied_folders
 
 
-def copy_files_from_csv_paths(csv_file, cut_mode=False, conflict_mode=None, exclude_pattern=None):
+def copy_files_from_csv_paths(csv_file, cut_mode=False, conflict_mode=None, exclude_pattern=None, max_workers=None):
     """从CSV路径复制文件/文件夹到目标路径
     Args:
         csv_file: CSV文件路径，第一列为源路径，第二列为目标路径
         cut_mode: 是否为剪切模式
         conflict_mode: 冲突处理模式
         exclude_pattern: 正则表达式模式，用于排除匹配的文件/文件夹名称
+        max_workers: 复制模式下的最大并发线程数
     """
     copied_items = []
     backup_paths = []
     source_paths = []
+    batch = _CopyBatch(max_workers)
     temp_backup_dir = ".temp_backup"
     operation_success = False
     error_message = None
@@ -830,8 +1511,15 @@ def copy_files_from_csv_paths(csv_file, cut_mode=False, conflict_mode=None, excl
     if conflict_mode is None:
         conflict_mode = DEFAULT_CONFLICT_MODE
 
+    _ensured_dirs.clear()
+    copy_counters = {}
+
     # 生成操作ID
-    operation_id = str(uuid.uuid4())
+    operation_id = _new_operation_id()
+    # 记录剪切/重命名已移动到的目标，备份文件名使用操作ID前缀加递增序号
+    moved = _MovedTargets(
+        backup_paths, os.path.join(temp_backup_dir, f"backup_{operation_id[:8]}_")
+    )
     operation_type = "剪切" if cut_mode else "复制"
 
     try:
@@ -848,135 +1536,138 @@ def copy_files_from_csv_paths(csv_file, cut_mode=False, conflict_mode=None, excl
             f"CSV文件读取成功，使用编码: {csv_result['encoding']}，共 {csv_result['total_rows']} 行数据"
         )
 
-        os.makedirs(temp_backup_dir, exist_ok=True)
-
         # 创建忽略函数（如果提供了排除模式）
         ignore_func = create_ignore_function(exclude_pattern)
 
+        # 循环中频繁调用的函数先绑定到局部变量，减少全局名称和属性查找
+        join = os.path.join
+        dirname = os.path.dirname
+        basename = os.path.basename
+        exists = os.path.exists
+        isfile = os.path.isfile
+        copy_file = _fast_copy
+
+        def run_copy_batch():
+            """执行已规划的复制任务，结果按CSV顺序汇总；有任务失败时抛出第一个异常"""
+            first_error = None
+            for (source_path, resolved_path), error in batch.run():
+                if error is not None:
+                    log.error("  复制操作发生异常: %s -> %s: %s", source_path, resolved_path, error)
+                    if first_error is None:
+                        first_error = error
+                    continue
+
+                copied_items.append(resolved_path)
+                source_paths.append(source_path)
+                log.debug("  复制成功: 已复制到 %s", resolved_path)
+
+            if first_error is not None:
+                raise first_error
+
         # 处理CSV数据
+        seen_rows = set()  # 源路径和目标路径都相同的重复行只处理一次
         for item in csv_result["data"]:
-            source_path = item["source_name"]
-            target_path = item["target_name"]
+            source_path = item.source_name
+            target_path = item.target_name
+
+            row_key = (source_path, target_path)
+            if row_key in seen_rows:
+                log.warning("  警告: 第%s行与前面的行重复，跳过: %s -> %s", item.row_number, source_path, target_path)
+                continue
+            seen_rows.add(row_key)
+
+            log.info("正在处理: %s -> %s (%s模式)", source_path, target_path, operation_type)
 
-            print(f"正在处理: {source_path} -> {target_path} ({operation_type}模式)")
+            # 源路径由前面尚未执行的行写入（如 a->b 之后 b->c）：先执行完这些行
+            if batch.writes(source_path):
+                run_copy_batch()
 
             # 检查源路径是否存在
-            if not os.path.exists(source_path):
-                print(f"  警告: 源路径不存在: {source_path}")
+            if not exists(source_path):
+                log.warning("  警告: 源路径不存在: %s", source_path)
                 continue
 
-            print(f"  源路径: {source_path}")
-            print(f"  目标路径: {target_path}")
+            log.debug("  源路径: %s", source_path)
+            log.debug("  目标路径: %s", target_path)
 
-            # 构建最终的目标路径（考虑路径类型和冲突解决）
-            resolved_path = build_final_target_path(source_path, target_path, conflict_mode)
+            # 构建最终的目标路径（考虑路径类型）
+            final_path, is_folder = _final_target_path(source_path, target_path)
+            # 目标与前面尚未执行的行的源或目标重叠：先执行完这些行，再按磁盘上的实际状态规划
+            if batch.uses(final_path):
+                run_copy_batch()
+                final_path, is_folder = _final_target_path(source_path, target_path)
+
+            # 处理冲突
+            resolved_path = resolve_conflict(
+                source_path, final_path, conflict_mode, is_folder=is_folder, pending=batch,
+                counters=copy_counters, move=cut_mode
+            )
             if resolved_path is None:
-                print(f"  跳过: {target_path}")
+                log.info("  跳过: %s", target_path)
                 continue
 
-            # 确保目标目录的父目录存在
-            os.makedirs(os.path.dirname(resolved_path), exist_ok=True)
-
             if cut_mode:
-                # 剪切模式：先备份再移动
-                temp_backup = os.path.join(
-                    temp_backup_dir,
-                    f"backup_{os.path.basename(source_path)}_{os.urandom(4).hex()}",
-                )
+                # 剪切模式：同一文件系统内直接重命名，否则先备份再移动
+                temp_backup = moved.backup_path(source_path)
                 try:
-                    # 检查源路径是否存在
-                    if not os.path.exists(source_path):
-                        print(f"  警告: 源路径不存在: {source_path}")
-                        continue
+                    # 确保目标目录的父目录存在
+                    _ensure_dir(dirname(resolved_path))
 
-                    # 1. 备份到临时位置
-                    print(f"  正在创建备份: {source_path} -> {temp_backup}")
-                    if os.path.isfile(source_path):
-                        shutil.copy2(source_path, temp_backup)
-                    elif os.path.isdir(source_path):
-                        shutil.copytree(source_path, temp_backup)
-                    print(f"  备份创建成功: {temp_backup}")
-                    backup_paths.append(temp_backup)
+                    log.debug("  正在移动: %s -> %s", source_path, resolved_path)
+                    backup_path = _safe_move(
+                        source_path, resolved_path, temp_backup, moved.needs_backup(resolved_path)
+                    )
+                    moved.add(resolved_path, backup_path)
                     source_paths.append(source_path)
-
-                    # 2. 移动文件/文件夹
-                    print(f"  正在移动: {source_path} -> {resolved_path}")
-                    shutil.move(source_path, resolved_path)
                     copied_items.append(resolved_path)
-
-                    # 验证移动是否成功
-                    if os.path.exists(resolved_path) and not os.path.exists(source_path):
-                        print(f"  {operation_type}成功: 已移动到 {resolved_path}")
-                    else:
-                        print(f"  警告: {operation_type}操作可能未完全成功")
-                        print(f"  源路径存在: {os.path.exists(source_path)}")
-                        print(f"  目标路径存在: {os.path.exists(resolved_path)}")
+                    log.debug("  %s成功: 已移动到 %s", operation_type, resolved_path)
 
                 except Exception as e:
-                    print(f"  {operation_type}操作发生异常: {e}")
-                    # 恢复备份
-                    if os.path.exists(temp_backup):
-                        try:
-                            if os.path.isfile(temp_backup):
-                                shutil.move(temp_backup, source_path)
-                            elif os.path.isdir(temp_backup):
-                                shutil.move(temp_backup, source_path)
-                            print(f"  {operation_type}失败，已从备份恢复到原位置")
-                        except Exception as restore_error:
-                            print(f"  恢复备份失败: {restore_error}")
-                            print(f"  备份文件位置: {temp_backup}")
-                    else:
-                        print(f"  备份文件不存在，无法恢复: {temp_backup}")
+                    log.error("  %s操作发生异常: %s", operation_type, e)
                     raise e
 
             else:
-                # 复制模式
-                try:
-                    if os.path.isfile(source_path):
-                        # 检查是否应排除文件
-                        if exclude_pattern:
-                            import re
-                            try:
-                                pattern = re.compile(exclude_pattern)
-                                if pattern.search(os.path.basename(source_path)):
-                                    print(f"  排除文件（匹配模式）: {source_path}")
-                                    continue
-                            except re.error:
-                                pass
-                        # 复制文件
-                        shutil.copy2(source_path, resolved_path)
-                    elif os.path.isdir(source_path):
-                        # 复制文件夹
-                        if conflict_mode == "merge" and os.path.exists(resolved_path):
-                            # 合并模式：合并文件夹内容
-                            print(f"  正在合并文件夹内容: {source_path} -> {resolved_path}")
-                            merge_folders(source_path, resolved_path)
-                        else:
-                            # 其他模式：复制文件夹
-                            if os.path.exists(resolved_path) and conflict_mode == "overwrite":
-                                # 覆盖模式：先删除现有文件夹
-                                shutil.rmtree(resolved_path)
-                            elif os.path.exists(resolved_path) and conflict_mode == "copy":
-                                # 副本模式：resolved_path已经是副本路径，直接复制
-                                pass
-                            shutil.copytree(source_path, resolved_path, ignore=ignore_func)
-                    
-                    copied_items.append(resolved_path)
-                    source_paths.append(source_path)
-                    print(f"  复制成功: 已复制到 {resolved_path}")
+                # 复制模式：只记录复制任务，与同一批次的其他任务并发执行
+                if isfile(source_path):
+                    # 检查是否应排除文件
+                    if exclude_pattern:
+                        import re
+                        try:
+                            pattern = re.compile(exclude_pattern)
+                            if pattern.search(basename(source_path)):
+                                log.debug("  排除文件（匹配模式）: %s", source_path)
+                                continue
+                        except re.error:
+                            pass
+                    # 复制文件
+                    task = functools.partial(copy_file, source_path, resolved_path)
+                elif conflict_mode == "merge" and (
+                    exists(resolved_path) or resolved_path in batch
+                ):
+                    # 合并模式：合并文件夹内容
+                    log.debug("  正在合并文件夹内容: %s -> %s", source_path, resolved_path)
+                    task = functools.partial(merge_folders, source_path, resolved_path)
+                else:
+                    # 其他模式：复制文件夹
+                    # 副本模式下 resolved_path 已经是副本路径，直接复制
+                    task = functools.partial(
+                        _copy_folder, source_path, resolved_path, conflict_mode, ignore_func
+                    )
 
-                except Exception as e:
-                    print(f"  复制操作发生异常: {e}")
-                    raise e
+                batch.add(source_path, resolved_path, task, (source_path, resolved_path))
+
+        # 并发执行剩余的复制任务
+        run_copy_batch()
 
         operation_success = True
 
     except Exception as e:
         error_message = str(e)
-        print(f"从CSV路径复制文件/文件夹操作失败: {e}")
+        log.error("从CSV路径复制文件/文件夹操作失败: %s", e)
         operation_success = False
 
     finally:
+        _flush_log()
         # 无论操作是否成功，都保存操作历史记录
         save_operation_history(
             operation_type=operation_type,
@@ -1064,7 +1755,7 @@ def get_file_info_async(file_path, collect_details=True, collect_resolution=Fals
         if collect_details:
             stat_info = os.stat(file_path)
             info["size"] = stat_info.st_size
-            info["mtime"] = datetime.fromtimestamp(stat_info.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+            info["mtime"] = _format_mtime(stat_info.st_mtime)
         else:
             info["size"] = ""
             info["mtime"] = ""
@@ -1092,6 +1783,50 @@ def get_file_info_async(file_path, collect_details=True, collect_resolution=Fals
             "error": str(e)
         }
 
+@functools.lru_cache(maxsize=4096)
+def _format_seconds(seconds):
+    # 直接调用 C 层的 strftime，不必为每个条目构造 datetime 对象
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+def _format_mtime(mtime):
+    """把修改时间格式化为 "YYYY-MM-DD HH:MM:SS"
+    Args:
+        mtime: st_mtime 时间戳
+    Returns:
+        格式化后的时间字符串
+    """
+    # 输出精确到秒，按整秒缓存：同一目录下的文件（解压、批量复制）修改时间常常相同
+    return _format_seconds(int(mtime // 1))
+
+
+def _csv_field(value):
+    """按 csv 模块的默认规则（QUOTE_MINIMAL）转换单个字段"""
+    if value is None:
+        return ""
+    text = str(value)
+    if "," in text or '"' in text or "\r" in text or "\n" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _write_csv_file(output_csv, headers, rows):
+    """写入带BOM的UTF-8 CSV文件，内容与 csv.writer 的输出一致
+
+    导出的字段都是路径、名称和数字，逐行拼接后直接编码写入带 1MiB 缓冲的二进制文件，
+    省去 csv.writer 和文本层逐行分派的开销。
+
+    Args:
+        output_csv: 输出CSV文件路径
+        headers: 表头
+        rows: 数据行列表
+    """
+    with open(output_csv, "wb", buffering=1024 * 1024) as f:
+        f.write(codecs.BOM_UTF8)
+        for row in itertools.chain((headers,), rows):
+            f.write((",".join(map(_csv_field, row)) + "\r\n").encode("utf-8"))
+
+
 def export_directory_structure_optimized(target_dir, output_csv, format_type="simple", recursive=True, 
                                         show_progress=True, max_workers=10, collect_details=True, collect_resolution=False):
     """优化的目录结构导出函数（异步处理+选择性收集）
@@ -1133,14 +1868,15 @@ def export_directory_structure_optimized(target_dir, output_csv, format_type="si
         # 第一阶段：收集所有数据到内存
         if recursive:
             # 递归遍历模式
+            # os.walk 返回的子目录路径都以 root_prefix 开头，层级等于其后的分隔符数量加一
+            root_prefix = os.path.join(target_dir, "")
             for root, dirs, files in os.walk(target_dir):
                 # 计算层级（相对target_dir）
-                rel_path = os.path.relpath(root, target_dir)
-                if rel_path == ".":
+                if root == target_dir:
                     level = 0
                     folder_name = os.path.basename(target_dir.rstrip("\\/"))
                 else:
-                    level = rel_path.count(os.sep) + 1
+                    level = root.count(os.sep, len(root_prefix)) + 1
                     folder_name = os.path.basename(root)
                 
                 if format_type == "simple":
@@ -1201,7 +1937,7 @@ def export_directory_structure_optimized(target_dir, output_csv, format_type="si
                             "文件夹",
                             root,
                             "",
-                            datetime.fromtimestamp(dir_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                            _format_mtime(dir_stat.st_mtime),
                             level
                         ])
                         total_items += 1
@@ -1273,7 +2009,7 @@ def export_directory_structure_optimized(target_dir, output_csv, format_type="si
                         "文件夹",
                         target_dir,
                         "",
-                        datetime.fromtimestamp(root_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                        _format_mtime(root_stat.st_mtime),
                         level
                     ])
                     total_items += 1
@@ -1291,22 +2027,24 @@ def export_directory_structure_optimized(target_dir, output_csv, format_type="si
             
             # 处理根目录下的文件和文件夹
             try:
-                items = os.listdir(target_dir)
+                # 使用 os.scandir：DirEntry 缓存了类型和 stat 结果，避免逐项 isdir/stat
+                with os.scandir(target_dir) as it:
+                    items = list(it)
                 files_to_process = []
                 dirs_to_process = []
                 
                 # 分离文件和文件夹
-                for item in items:
-                    item_path = os.path.join(target_dir, item)
-                    if os.path.isdir(item_path):
-                        dirs_to_process.append((item, item_path))
+                for entry in items:
+                    if entry.is_dir():
+                        dirs_to_process.append(entry)
                     else:
-                        files_to_process.append((item, item_path))
+                        files_to_process.append((entry.name, entry.path))
                 
                 # 处理文件夹（非异步）
-                for item, item_path in dirs_to_process:
+                for entry in dirs_to_process:
+                    item, item_path = entry.name, entry.path
                     try:
-                        item_stat = os.stat(item_path)
+                        item_stat = entry.stat()
                         if format_type == "simple":
                             all_rows.append([level + 1, "Folder", f"    {item}", item_path])
                         else:
@@ -1315,7 +2053,7 @@ def export_directory_structure_optimized(target_dir, output_csv, format_type="si
                                 "文件夹",
                                 item_path,
                                 "",
-                                datetime.fromtimestamp(item_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                                _format_mtime(item_stat.st_mtime),
                                 level + 1
                             ])
                         total_items += 1
@@ -1384,12 +2122,7 @@ def export_directory_structure_optimized(target_dir, output_csv, format_type="si
             print("正在写入CSV文件...")
         
         # 第二阶段：批量写入CSV文件
-        with open(output_csv, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
-            # 批量写入所有数据
-            writer.writerows(all_rows)
+        _write_csv_file(output_csv, headers, all_rows)
         
         end_time = time.time()
         processing_time = end_time - start_time
@@ -1476,16 +2209,18 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
         
         # 第一阶段：收集所有数据到内存
         if recursive:
-            # 递归遍历模式
-            for root, dirs, files in os.walk(target_dir):
-                # 计算层级（相对target_dir）
-                rel_path = os.path.relpath(root, target_dir)
-                if rel_path == ".":
+            # 递归遍历模式：层级随遍历传递，子文件夹的 DirEntry 留给详细格式取修改时间
+            subdirs = {}
+            for root, dirs, files in _scan_tree(target_dir):
+                if root == target_dir:
                     level = 0
                     folder_name = os.path.basename(target_dir.rstrip("\\/"))
+                    root_entry = None
                 else:
-                    level = rel_path.count(os.sep) + 1
-                    folder_name = os.path.basename(root)
+                    level, root_entry = subdirs.pop(root)
+                    folder_name = root_entry.name
+                for entry in dirs:
+                    subdirs[entry.path] = (level + 1, entry)
                 
                 if format_type == "simple":
                     # 简单格式：使用缩进
@@ -1494,22 +2229,21 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
                     total_items += 1
                     
                     # 处理文件
-                    for file in files:
-                        file_level = level + 1
-                        indent_file = "    " * file_level
-                        full_path = os.path.join(root, file)
-                        all_rows.append([file_level, "File", f"{indent_file}{file}", full_path])
+                    file_level = level + 1
+                    indent_file = "    " * file_level
+                    for entry in files:
+                        all_rows.append([file_level, "File", f"{indent_file}{entry.name}", entry.path])
                         total_items += 1
                 else:
                     # 详细格式：包含大小和时间信息
                     try:
-                        dir_stat = os.stat(root)
+                        dir_stat = os.stat(root) if root_entry is None else root_entry.stat()
                         all_rows.append([
                             folder_name,
                             "文件夹",
                             root,
                             "",
-                            datetime.fromtimestamp(dir_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                            _format_mtime(dir_stat.st_mtime),
                             level
                         ])
                         total_items += 1
@@ -1518,17 +2252,18 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
                         all_rows.append([folder_name, "文件夹", root, "无法访问", "", level])
                         total_items += 1
                     
-                    # 处理文件
-                    for file in files:
-                        file_path = os.path.join(root, file)
+                    # 处理文件（DirEntry.stat 在 Windows 上直接使用目录枚举时返回的信息）
+                    for entry in files:
+                        file = entry.name
+                        file_path = entry.path
                         try:
-                            file_stat = os.stat(file_path)
+                            file_stat = entry.stat()
                             all_rows.append([
                                 file,
                                 "文件",
                                 file_path,
                                 file_stat.st_size,
-                                datetime.fromtimestamp(file_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                                _format_mtime(file_stat.st_mtime),
                                 level + 1
                             ])
                             total_items += 1
@@ -1560,7 +2295,7 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
                         "文件夹",
                         target_dir,
                         "",
-                        datetime.fromtimestamp(root_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                        _format_mtime(root_stat.st_mtime),
                         level
                     ])
                     total_items += 1
@@ -1578,12 +2313,14 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
             
             # 处理根目录下的文件和文件夹
             try:
-                items = os.listdir(target_dir)
-                for item in items:
-                    item_path = os.path.join(target_dir, item)
+                with os.scandir(target_dir) as it:
+                    items = list(it)
+                for entry in items:
+                    item = entry.name
+                    item_path = entry.path
                     try:
-                        item_stat = os.stat(item_path)
-                        if os.path.isdir(item_path):
+                        item_stat = entry.stat()
+                        if entry.is_dir():
                             if format_type == "simple":
                                 all_rows.append([level + 1, "Folder", f"    {item}", item_path])
                             else:
@@ -1592,7 +2329,7 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
                                     "文件夹",
                                     item_path,
                                     "",
-                                    datetime.fromtimestamp(item_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                                    _format_mtime(item_stat.st_mtime),
                                     level + 1
                                 ])
                         else:
@@ -1604,7 +2341,7 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
                                     "文件",
                                     item_path,
                                     item_stat.st_size,
-                                    datetime.fromtimestamp(item_stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                                    _format_mtime(item_stat.st_mtime),
                                     level + 1
                                 ])
                         total_items += 1
@@ -1636,12 +2373,7 @@ def export_directory_structure(target_dir, output_csv, format_type="simple", rec
             print("正在写入CSV文件...")
         
         # 第二阶段：批量写入CSV文件
-        with open(output_csv, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            
-            # 批量写入所有数据
-            writer.writerows(all_rows)
+        _write_csv_file(output_csv, headers, all_rows)
         
         end_time = time.time()
         processing_time = end_time - start_time
@@ -1710,6 +2442,93 @@ def export_directory_to_csv(target_dir, output_csv, recursive=True):
     return export_directory_structure(target_dir, output_csv, format_type="detailed", recursive=recursive, show_progress=False)
 
 
+# 操作历史记录：每行一条 JSON 记录（JSONL），保存时只追加一行
+HISTORY_FILE = ".operation_history.jsonl"
+# 旧版本使用的 JSON 数组格式历史记录，首次使用时自动转换
+_LEGACY_HISTORY_FILE = ".operation_history.json"
+
+# 上次清理检查时历史记录文件的状态：文件路径 -> (大小, 修改时间, 最大条数)
+_history_cleanup_checked = {}
+
+
+def _history_file():
+    """返回历史记录文件路径，存在旧版 JSON 数组格式的历史记录时先转换为 JSONL"""
+    if os.path.exists(_LEGACY_HISTORY_FILE) and not os.path.exists(HISTORY_FILE):
+        try:
+            with open(_LEGACY_HISTORY_FILE, "r", encoding="utf-8") as f:
+                history = json.load(f)
+            # 先写临时文件再原子替换，转换中途中断也不会留下半截的 JSONL 文件
+            temp_file = HISTORY_FILE + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for record in history:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(temp_file, HISTORY_FILE)
+            os.remove(_LEGACY_HISTORY_FILE)
+        except (OSError, ValueError) as e:
+            print(f"转换旧版历史记录失败: {e}")
+    return HISTORY_FILE
+
+
+def _iter_history_reversed(history_file, block_size=64 * 1024):
+    """从文件末尾开始逐条读取历史记录，不需要读入整个文件
+    Args:
+        history_file: 历史记录文件路径
+        block_size: 每次向前读取的字节数
+    Yields:
+        dict: 历史记录，从最新到最旧；无法解析的行直接跳过
+    """
+    loads = json.loads if orjson is None else orjson.loads
+    with open(history_file, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # 第一行可能不完整，留到读取前一块时拼接
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    try:
+                        yield loads(line)
+                    except ValueError:
+                        continue
+        if remainder.strip():
+            try:
+                yield loads(remainder)
+            except ValueError:
+                pass
+
+
+def _find_last_completed_operation(history_file):
+    """找到最近一次未撤回的操作
+    Args:
+        history_file: 历史记录文件路径
+    Returns:
+        dict: 操作记录，没有可撤回的操作时返回 None
+    """
+    # 撤回时追加 status 为 undone 的记录，它总是出现在原操作之后
+    undone_ids = set()
+    for record in _iter_history_reversed(history_file):
+        status = record.get("status")
+        if status == "undone":
+            undone_ids.add(record.get("id"))
+        elif status == "completed" and record.get("id") not in undone_ids:
+            return record
+    return None
+
+
+def _append_history(history_file, record):
+    """向历史记录文件末尾追加一条记录"""
+    if orjson is not None:
+        data = orjson.dumps(record) + b"\n"
+    else:
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+    with open(history_file, "ab") as f:
+        f.write(data)
+
+
 def save_operation_history(
     operation_type,
     source_paths,
@@ -1720,20 +2539,11 @@ def save_operation_history(
     error_message=None,
 ):
     """保存操作历史记录"""
-    history_file = ".operation_history.json"
-
-    # 读取现有历史记录
-    history = []
-    if os.path.exists(history_file):
-        try:
-            with open(history_file, "r", encoding="utf-8") as f:
-                history = json.load(f)
-        except:
-            history = []
+    history_file = _history_file()
 
     # 创建新操作记录
     if operation_id is None:
-        operation_id = str(uuid.uuid4())
+        operation_id = _new_operation_id()
 
     operation_record = {
         "id": operation_id,
@@ -1747,74 +2557,60 @@ def save_operation_history(
         "error_message": error_message,
     }
 
-    # 添加到历史记录
-    history.append(operation_record)
-
-    # 保存历史记录
-    with open(history_file, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    # 追加到历史记录
+    _append_history(history_file, operation_record)
 
     return operation_id
 
 
 def undo_last_operation():
     """撤回上一次操作"""
-    history_file = ".operation_history.json"
+    history_file = _history_file()
 
     if not os.path.exists(history_file):
         print("没有操作历史记录")
         return False
 
+    # 找到最近未撤回的操作
     try:
-        with open(history_file, "r", encoding="utf-8") as f:
-            history = json.load(f)
-    except:
+        last_operation = _find_last_completed_operation(history_file)
+    except OSError:
         print("无法读取操作历史记录")
         return False
 
-    if not history:
-        print("没有可撤回的操作")
-        return False
-
-    # 找到最近未撤回的操作
-    last_operation = None
-    for op in reversed(history):
-        if op.get("status") == "completed":
-            last_operation = op
-            break
-
     if not last_operation:
         print("没有可撤回的操作")
         return False
 
     print(f"正在撤回操作: {last_operation['type']} (ID: {last_operation['id']})")
 
+    _ensured_dirs.clear()
+
     try:
         if last_operation["type"] == "剪切":
             # 撤回剪切操作：从备份恢复，删除目标文件
             success_count = 0
-            for i, (backup_path, target_path) in enumerate(
+            # 按相反的顺序撤回：后面的行可能移走或覆盖了前面的行移动到的目标
+            for i, (backup_path, target_path) in reversed(list(enumerate(
                 zip(last_operation["backup_paths"], last_operation["target_paths"])
-            ):
+            ))):
                 try:
-                    if os.path.exists(backup_path):
+                    source_path = last_operation["source_paths"][i]
+                    if backup_path is None:
+                        # 直接重命名的操作没有备份：把目标重命名回源路径
+                        if os.path.exists(target_path):
+                            _move_back(target_path, source_path)
+                            success_count += 1
+                            print(f"  已撤回: {target_path} -> {source_path}")
+                        else:
+                            print(f"  警告: 目标文件不存在: {target_path}")
+                    elif os.path.exists(backup_path):
                         # 恢复文件到对应的源路径
-                        source_path = last_operation["source_paths"][i]
-
-                        # 确保源目录存在
-                        os.makedirs(os.path.dirname(source_path), exist_ok=True)
-
-                        if os.path.isfile(backup_path):
-                            shutil.move(backup_path, source_path)
-                        elif os.path.isdir(backup_path):
-                            shutil.move(backup_path, source_path)
+                        _move_back(backup_path, source_path)
 
                         # 删除目标文件（包括副本文件）
-                        if os.path.exists(target_path) and target_path != source_path:
-                            if os.path.isfile(target_path):
-                                os.remove(target_path)
-                            elif os.path.isdir(target_path):
-                                shutil.rmtree(target_path)
+                        if target_path != source_path:
+                            _remove_path(target_path)
 
                         success_count += 1
                         print(f"  已撤回: {target_path} -> {source_path}")
@@ -1835,11 +2631,7 @@ def undo_last_operation():
             success_count = 0
             for target_path in last_operation["target_paths"]:
                 try:
-                    if os.path.exists(target_path):
-                        if os.path.isfile(target_path):
-                            os.remove(target_path)
-                        elif os.path.isdir(target_path):
-                            shutil.rmtree(target_path)
+                    if _remove_path(target_path):
                         success_count += 1
                         print(f"  已删除: {target_path}")
                     else:
@@ -1856,28 +2648,27 @@ def undo_last_operation():
         elif last_operation["type"] == "重命名":
             # 撤回重命名操作：从备份恢复，删除重命名后的文件（包括副本文件）
             success_count = 0
-            for i, (backup_path, target_path) in enumerate(
+            # 按相反的顺序撤回：后面的行可能移走或覆盖了前面的行移动到的目标
+            for i, (backup_path, target_path) in reversed(list(enumerate(
                 zip(last_operation["backup_paths"], last_operation["target_paths"])
-            ):
+            ))):
                 try:
-                    if os.path.exists(backup_path):
+                    source_path = last_operation["source_paths"][i]
+                    if backup_path is None:
+                        # 直接重命名的操作没有备份：把目标重命名回源路径
+                        if os.path.exists(target_path):
+                            _move_back(target_path, source_path)
+                            success_count += 1
+                            print(f"  已撤回: {target_path} -> {source_path}")
+                        else:
+                            print(f"  警告: 目标文件不存在: {target_path}")
+                    elif os.path.exists(backup_path):
                         # 恢复文件到对应的源路径
-                        source_path = last_operation["source_paths"][i]
-
-                        # 确保源目录存在
-                        os.makedirs(os.path.dirname(source_path), exist_ok=True)
-
-                        if os.path.isfile(backup_path):
-                            shutil.move(backup_path, source_path)
-                        elif os.path.isdir(backup_path):
-                            shutil.move(backup_path, source_path)
+                        _move_back(backup_path, source_path)
 
                         # 删除重命名后的文件（包括副本文件）
-                        if os.path.exists(target_path) and target_path != source_path:
-                            if os.path.isfile(target_path):
-                                os.remove(target_path)
-                            elif os.path.isdir(target_path):
-                                shutil.rmtree(target_path)
+                        if target_path != source_path:
+                            _remove_path(target_path)
 
                         success_count += 1
                         print(f"  已撤回: {target_path} -> {source_path}")
@@ -1893,13 +2684,16 @@ def undo_last_operation():
                 print("撤回操作失败，没有文件被成功撤回")
                 return False
 
-        # 更新操作状态
-        last_operation["status"] = "undone"
-        last_operation["undo_timestamp"] = datetime.now().isoformat()
-
-        # 保存更新后的历史记录
-        with open(history_file, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
+        # 追加撤回记录，标记该操作已撤回
+        _append_history(
+            history_file,
+            {
+                "id": last_operation["id"],
+                "type": last_operation["type"],
+                "status": "undone",
+                "undo_timestamp": datetime.now().isoformat(),
+            },
+        )
 
         print("撤回操作成功")
         return True
@@ -1922,30 +2716,28 @@ def cleanup_backup_files(keep_recent=False):
         if keep_recent:
             # 只清理非最近操作的备份文件
             # 读取历史记录找到最近操作的备份文件
-            history_file = ".operation_history.json"
+            history_file = _history_file()
             recent_backups = set()
 
             if os.path.exists(history_file):
                 try:
-                    with open(history_file, "r", encoding="utf-8") as f:
-                        history = json.load(f)
-
                     # 找到最近未撤回的操作
-                    for op in reversed(history):
-                        if op.get("status") == "completed":
-                            recent_backups.update(op.get("backup_paths", []))
-                            break
+                    last_operation = _find_last_completed_operation(history_file)
+                    if last_operation:
+                        recent_backups.update(last_operation.get("backup_paths", []))
                 except:
                     pass
 
             # 清理非最近备份
-            for item in os.listdir(temp_backup_dir):
-                item_path = os.path.join(temp_backup_dir, item)
-                if item_path not in recent_backups:
-                    if os.path.isfile(item_path):
-                        os.remove(item_path)
-                    elif os.path.isdir(item_path):
-                        shutil.rmtree(item_path)
+            with os.scandir(temp_backup_dir) as it:
+                for entry in it:
+                    if entry.path in recent_backups:
+                        continue
+                    # DirEntry 已带有类型信息，不需要先尝试按文件删除
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.remove(entry.path)
             print("已清理旧备份文件，保留最近操作的备份")
         else:
             # 清理所有备份文件
@@ -1959,28 +2751,41 @@ def cleanup_backup_files(keep_recent=False):
 
 
 def cleanup_old_history(max_entries=5000):
-    """清理旧的历史记录，防止JSON文件过大
+    """清理旧的历史记录，防止历史记录文件过大
     Args:
         max_entries: 最大保留的历史记录条数
     """
-    history_file = ".operation_history.json"
+    history_file = _history_file()
 
-    if not os.path.exists(history_file):
+    try:
+        file_stat = os.stat(history_file)
+    except OSError:
+        return
+
+    # 菜单每次操作后都会调用；文件自上次检查后没有变化时无需重新读取
+    state = (file_stat.st_size, file_stat.st_mtime_ns, max_entries)
+    if _history_cleanup_checked.get(history_file) == state:
         return
 
     try:
-        with open(history_file, "r", encoding="utf-8") as f:
-            history = json.load(f)
+        # 只保留最后 max_entries 行，不需要解析记录内容
+        with open(history_file, "rb") as f:
+            total = 0
+            recent = collections.deque(maxlen=max_entries)
+            for line in f:
+                total += 1
+                recent.append(line)
 
         # 如果历史记录超过最大限制，删除最旧的部分
-        if len(history) > max_entries:
-            # 保留最近的 max_entries 条记录
-            history = history[-max_entries:]
-
-            with open(history_file, "w", encoding="utf-8") as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
+        if total > max_entries:
+            temp_file = history_file + ".tmp"
+            with open(temp_file, "wb") as f:
+                f.writelines(recent)
+            os.replace(temp_file, history_file)
 
             print(f"已清理历史记录，保留最近 {max_entries} 条操作")
+        else:
+            _history_cleanup_checked[history_file] = state
 
     except Exception as e:
         print(f"清理历史记录失败: {e}")
@@ -2018,14 +2823,13 @@ def identify_path_type(path):
         return 'directory'
 
 
-def build_final_target_path(source_path, target_path, conflict_mode):
-    """构建最终的目标路径
+def _final_target_path(source_path, target_path):
+    """根据源和目标的路径类型计算最终目标路径（不处理冲突）
     Args:
         source_path: 源路径
         target_path: 目标路径
-        conflict_mode: 冲突处理模式
     Returns:
-        处理后的目标路径，或None表示跳过
+        tuple: (最终目标路径, 源是否为文件夹)
     """
     source_type = identify_path_type(source_path)
     target_type = identify_path_type(target_path)
@@ -2044,10 +2848,26 @@ def build_final_target_path(source_path, target_path, conflict_mode):
         else:
             # 文件夹复制到具体路径：使用指定路径
             final_path = target_path
-    
+
+    return final_path, source_type == 'directory'
+
+
+def build_final_target_path(source_path, target_path, conflict_mode, pending=None, counters=None):
+    """构建最终的目标路径
+    Args:
+        source_path: 源路径
+        target_path: 目标路径
+        conflict_mode: 冲突处理模式
+        pending: 本次操作中已规划、尚未写入磁盘的路径集合（视为已存在）
+        counters: 本次操作的副本编号缓存，见 generate_copy_name
+    Returns:
+        处理后的目标路径，或None表示跳过
+    """
+    final_path, is_folder = _final_target_path(source_path, target_path)
+
     # 应用冲突解决模式
-    return resolve_conflict(source_path, final_path, conflict_mode, 
-                           is_folder=(source_type == 'directory'))
+    return resolve_conflict(source_path, final_path, conflict_mode,
+                            is_folder=is_folder, pending=pending, counters=counters)
 
 
 def select_conflict_mode():
@@ -2067,6 +2887,11 @@ def select_conflict_mode():
 
 
 if __name__ == "__main__":
+    # 交互模式下显示 INFO 及以上的过程信息，逐项的详细信息（DEBUG）不输出
+    log_handler = _BufferedStdoutHandler()
+    log_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[log_handler])
+
     while True:
         try:
             # ===== 功能选择界面 =====
@@ -5,14 +5,16 @@
 
 import os
 import tempfile
-import shutil
 import csv
-from Pyzard import search_and_copy_files, extract_entire_folder, rename_files_in_place, copy_files_from_csv_paths
+from Pyzard import search_and_copy_files, extract_entire_folder, rename_files_in_place, copy_files_from_csv_paths, generate_copy_name, resolve_conflict
 
-def create_test_files():
-    """创建测试文件和目录"""
-    # 创建临时目录
-    temp_dir = tempfile.mkdtemp()
+def create_test_files(base_dir):
+    """在临时目录中创建测试文件和目录
+
+    Args:
+        base_dir: 临时目录（pytest 的 tmp_path，或直接运行时的临时目录）
+    """
+    temp_dir = os.fspath(base_dir)
     print(f"创建测试目录: {temp_dir}")
     
     # 创建源目录结构
@@ -49,11 +51,11 @@ def create_test_files():
     
     return temp_dir, source_dir, target_dir
 
-def test_skip_mode():
+def test_skip_mode(tmp_path):
     """测试跳过模式"""
     print("\n=== 测试1: 跳过模式 (skip) ===")
     
-    temp_dir, source_dir, target_dir = create_test_files()
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
     
     # 创建CSV文件
     csv_file = os.path.join(temp_dir, "files.csv")
@@ -76,15 +78,12 @@ def test_skip_mode():
             
     except Exception as e:
         print(f"测试失败: {e}")
-    
-    # 清理
-    shutil.rmtree(temp_dir)
 
-def test_overwrite_mode():
+def test_overwrite_mode(tmp_path):
     """测试覆盖模式"""
     print("\n=== 测试2: 覆盖模式 (overwrite) ===")
     
-    temp_dir, source_dir, target_dir = create_test_files()
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
     
     # 创建CSV文件
     csv_file = os.path.join(temp_dir, "files.csv")
@@ -108,15 +107,12 @@ def test_overwrite_mode():
                 
     except Exception as e:
         print(f"测试失败: {e}")
-    
-    # 清理
-    shutil.rmtree(temp_dir)
 
-def test_copy_mode():
+def test_copy_mode(tmp_path):
     """测试副本模式"""
     print("\n=== 测试3: 副本模式 (copy) ===")
     
-    temp_dir, source_dir, target_dir = create_test_files()
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
     
     # 创建CSV文件
     csv_file = os.path.join(temp_dir, "files.csv")
@@ -138,15 +134,12 @@ def test_copy_mode():
             
     except Exception as e:
         print(f"测试失败: {e}")
-    
-    # 清理
-    shutil.rmtree(temp_dir)
 
-def test_merge_mode():
+def test_merge_mode(tmp_path):
     """测试合并模式（仅文件夹）"""
     print("\n=== 测试4: 合并模式 (merge) ===")
     
-    temp_dir, source_dir, target_dir = create_test_files()
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
     
     # 在源文件夹中添加更多文件
     source_folder = os.path.join(source_dir, "folder1")
@@ -174,15 +167,12 @@ def test_merge_mode():
             
     except Exception as e:
         print(f"测试失败: {e}")
-    
-    # 清理
-    shutil.rmtree(temp_dir)
 
-def test_rename_conflict():
+def test_rename_conflict(tmp_path):
     """测试重命名冲突处理"""
     print("\n=== 测试5: 重命名冲突处理 ===")
     
-    temp_dir, source_dir, target_dir = create_test_files()
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
     
     # 在源目录中创建重命名冲突文件
     with open(os.path.join(source_dir, "conflict.txt"), "w") as f:
@@ -212,18 +202,124 @@ def test_rename_conflict():
             
     except Exception as e:
         print(f"测试失败: {e}")
+
+def write_csv(csv_file, rows):
+    """写入两列的映射CSV文件"""
+    with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
+        csv.writer(f).writerows(rows)
+
+def test_copy_mode_pending_conflicts(tmp_path):
+    """测试同一次复制中多行写入同一目标时的副本编号"""
+    print("\n=== 测试6: 同一次操作中的多个冲突 (copy) ===")
+    
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
+    
+    # 目标中已有 file1.txt，两行都要写入 file1.txt
+    csv_file = os.path.join(temp_dir, "files.csv")
+    write_csv(csv_file, [["file1.txt", "file1.txt"], ["file2.txt", "file1.txt"]])
+    
+    result = search_and_copy_files(source_dir, target_dir, csv_file, cut_mode=False, conflict_mode="copy")
+    print(f"操作结果: {result}")
+    
+    # 第二行规划时第一行的副本尚未写入磁盘，也不能重复使用同一个副本名
+    assert [os.path.basename(path) for path in result] == ["file1_副本1.txt", "file1_副本2.txt"], "副本编号不正确"
+    with open(os.path.join(target_dir, "file1_副本2.txt"), "r") as f:
+        assert f.read() == "这是file2.txt的内容", "副本内容不正确"
+    print("验证通过: 每行得到各自的副本")
+
+def test_csv_paths_nested_target(tmp_path):
+    """测试后一行的目标位于前一行复制出的文件夹内"""
+    print("\n=== 测试7: 目标嵌套在前一行的目标中 ===")
+    
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
+    
+    # 第一行把 folder1 复制为 target/X/folder1，第二行写入该文件夹内部
+    nested_dir = os.path.join(target_dir, "X")
+    csv_file = os.path.join(temp_dir, "paths.csv")
+    write_csv(csv_file, [
+        [os.path.join(source_dir, "folder1"), nested_dir],
+        [os.path.join(source_dir, "file2.txt"), os.path.join(nested_dir, "folder1", "file2.txt")],
+    ])
+    
+    result = copy_files_from_csv_paths(csv_file, cut_mode=False, conflict_mode="copy")
+    print(f"操作结果: {result}")
+    
+    assert len(result) == 2, "两行都应复制成功"
+    assert os.path.exists(os.path.join(nested_dir, "folder1", "test.txt")), "文件夹未被复制"
+    assert os.path.exists(os.path.join(nested_dir, "folder1", "file2.txt")), "嵌套的文件未被复制"
+    print("验证通过: 两行都已复制")
+
+def test_csv_paths_chained_rows(tmp_path):
+    """测试后一行的源路径由前一行复制产生"""
+    print("\n=== 测试8: 源路径由前一行生成 ===")
+    
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
+    
+    # file1.txt -> a.txt，再 a.txt -> b.txt
+    first_copy = os.path.join(target_dir, "a.txt")
+    second_copy = os.path.join(target_dir, "b.txt")
+    csv_file = os.path.join(temp_dir, "paths.csv")
+    write_csv(csv_file, [
+        [os.path.join(source_dir, "file1.txt"), first_copy],
+        [first_copy, second_copy],
+    ])
+    
+    result = copy_files_from_csv_paths(csv_file, cut_mode=False, conflict_mode="copy")
+    print(f"操作结果: {result}")
+    
+    assert result == [first_copy, second_copy], "两行都应复制成功"
+    with open(second_copy, "r") as f:
+        assert f.read() == "这是file1.txt的内容", "第二行复制的内容不正确"
+    print("验证通过: 第二行复制了第一行的结果")
+
+def test_generate_copy_name_stateless(tmp_path):
+    """测试单独调用 generate_copy_name 不会沿用上一次的编号"""
+    print("\n=== 测试9: 副本名称不依赖之前的调用 ===")
+    
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
+    original = os.path.join(target_dir, "file1.txt")
+    
+    # 目录未变化时，重复调用应得到相同的副本名
+    first = generate_copy_name(original)
+    second = generate_copy_name(original)
+    print(f"两次调用结果: {first}, {second}")
+    assert os.path.basename(first) == os.path.basename(second) == "file1_副本1.txt", "副本编号不应累加"
     
-    # 清理
-    shutil.rmtree(temp_dir)
+    # 一次操作分配过的编号不影响之后的调用
+    csv_file = os.path.join(temp_dir, "files.csv")
+    write_csv(csv_file, [["file1.txt", "file1.txt"]])
+    search_and_copy_files(source_dir, target_dir, csv_file, cut_mode=False, conflict_mode="copy")
+    os.remove(os.path.join(target_dir, "file1_副本1.txt"))
+    assert os.path.basename(generate_copy_name(original)) == "file1_副本1.txt", "副本编号应从1开始"
+    print("验证通过: 副本编号从1开始")
+
+def test_same_file_target(tmp_path):
+    """测试目标与源是同一个文件时的覆盖模式"""
+    print("\n=== 测试10: 目标与源是同一个文件 (overwrite) ===")
+    
+    temp_dir, source_dir, target_dir = create_test_files(tmp_path)
+    source = os.path.join(source_dir, "file1.txt")
+    
+    # 硬链接与源是同一个文件，相当于大小写不敏感文件系统上只差大小写的路径
+    alias = os.path.join(source_dir, "FILE1.txt")
+    os.link(source, alias)
+    
+    # 复制到自身没有意义，直接跳过
+    assert resolve_conflict(source, alias, "overwrite") is None, "复制到自身应跳过"
+    # 重命名时路径不同就不能跳过（例如只改变大小写）
+    assert resolve_conflict(source, alias, "overwrite", move=True) == alias, "重命名不应被跳过"
+    assert resolve_conflict(source, source, "overwrite", move=True) is None, "移动到自身应跳过"
+    print("验证通过: 只跳过真正相同的目标")
 
 if __name__ == "__main__":
     print("开始测试各种冲突处理模式...")
     
-    # 运行所有测试
-    test_skip_mode()
-    test_overwrite_mode()
-    test_copy_mode()
-    test_merge_mode()
-    test_rename_conflict()
+    # 运行所有测试，每个测试使用独立的临时目录，结束后自动删除
+    for test in (test_skip_mode, test_overwrite_mode, test_copy_mode,
+                 test_merge_mode, test_rename_conflict, test_copy_mode_pending_conflicts,
+                 test_csv_paths_nested_target, test_csv_paths_chained_rows,
+                 test_generate_copy_name_stateless, test_same_file_target):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test(temp_dir)
     
     print("\n=== 测试完成 ===")
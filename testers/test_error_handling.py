@@ -141,15 +141,15 @@ def test_history_recording():
         print(f"成功操作结果: {result}")
 
         # 检查历史记录文件是否存在
-        history_file = ".operation_history.json"
+        history_file = ".operation_history.jsonl"
         if os.path.exists(history_file):
             print("历史记录文件已创建")
 
-            # 读取历史记录
+            # 读取历史记录（每行一条JSON记录）
             import json
 
             with open(history_file, "r", encoding="utf-8") as f:
-                history = json.load(f)
+                history = [json.loads(line) for line in f if line.strip()]
 
             if history:
                 last_op = history[-1]
@@ -157,6 +157,14 @@ class PyzardTester:
         assert result["success"], f"GBK CSV读取失败: {result.get('error', '未知错误')}"
         assert result["encoding"] == "gbk", f"编码检测错误: {result['encoding']}"
 
+        # 测试较短的GBK文件：安装了 chardet 时它常被误判为 ISO-8859-1、IBM855 等单字节编码
+        for row in (["a.txt", "报告.txt"], ["IMG_001.jpg", "旅行_001.jpg"]):
+            short_gbk_csv = self.create_test_csv("test_gbk_short.csv", "gbk", [row])
+            result = Pyzard.read_csv_with_encoding_detection(short_gbk_csv)
+            assert result["success"], f"GBK CSV读取失败: {result.get('error', '未知错误')}"
+            decoded = [result["data"][0].source_name, result["data"][0].target_name]
+            assert decoded == row, f"GBK解码错误: {decoded} (编码: {result['encoding']})"
+
         # 测试UTF-8编码（无BOM）
         utf8_nobom_csv = self.create_test_csv("test_utf8_nobom.csv", "utf-8")
         result = Pyzard.read_csv_with_encoding_detection(utf8_nobom_csv)
@@ -164,6 +172,12 @@ class PyzardTester:
             "success"
         ], f"UTF-8无BOM CSV读取失败: {result.get('error', '未知错误')}"
 
+        # 测试列数不是2列的行：只有一列时目标名称使用源名称，多出的列忽略
+        columns_csv = self.create_test_csv("test_columns.csv", data=[["文档1.txt"], ["图片1.jpg", "新图片1.jpg", "备注"]])
+        result = Pyzard.read_csv_with_encoding_detection(columns_csv)
+        names = [(row.source_name, row.target_name) for row in result["data"]]
+        assert names == [("文档1.txt", "文档1.txt"), ("图片1.jpg", "新图片1.jpg")], f"列处理错误: {names}"
+
         print("✅ CSV编码检测测试通过")
 
     def test_search_and_copy_files(self):
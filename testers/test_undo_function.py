@@ -7,7 +7,8 @@ import os
 import tempfile
 import shutil
 import csv
-from Pyzard import search_and_copy_files, undo_last_operation
+import json
+from Pyzard import search_and_copy_files, extract_entire_folder, rename_files_in_place, undo_last_operation, HISTORY_FILE
 
 def test_undo_with_conflict_modes():
     """测试撤回功能是否支持冲突处理模式"""
@@ -79,6 +80,206 @@ def test_undo_with_conflict_modes():
         shutil.rmtree(temp_dir)
         print(f"清理测试目录: {temp_dir}")
 
+def read_history():
+    """读取当前目录下的操作历史记录（JSONL，每行一条）"""
+    with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_undo_rename_without_backup():
+    """测试撤回没有备份的重命名操作（同一文件系统内直接改名）"""
+    print("=== 测试撤回无备份的重命名操作 ===")
+    
+    # 历史记录和备份都写在当前目录，切换到临时目录避免互相影响
+    temp_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(temp_dir)
+    print(f"创建测试目录: {temp_dir}")
+    
+    try:
+        source_file = os.path.join(temp_dir, "a.txt")
+        renamed_file = os.path.join(temp_dir, "b.txt")
+        with open(source_file, "w", encoding="utf-8") as f:
+            f.write("原始内容")
+        
+        csv_file = os.path.join(temp_dir, "rename.csv")
+        with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerow([source_file, renamed_file])
+        
+        # 1. 同一文件系统内重命名不创建备份，历史记录中备份路径为 None
+        print("\n1. 重命名文件")
+        rename_files_in_place(temp_dir, csv_file, conflict_mode="copy")
+        last_record = read_history()[-1]
+        assert last_record["backup_paths"] == [None], f"不应创建备份: {last_record['backup_paths']}"
+        assert not os.path.exists(".temp_backup"), "不应创建备份目录"
+        print("✓ 重命名未创建备份")
+        
+        # 2. 撤回时把目标改回源路径
+        print("\n2. 撤回重命名")
+        assert undo_last_operation(), "撤回操作失败"
+        assert os.path.exists(source_file) and not os.path.exists(renamed_file), "文件未恢复到原路径"
+        with open(source_file, "r", encoding="utf-8") as f:
+            assert f.read() == "原始内容", "恢复后的文件内容不正确"
+        print("✓ 文件已改回原路径")
+        
+        # 3. 目标文件被删除后无法撤回（没有备份可用）
+        print("\n3. 目标文件被删除后撤回")
+        rename_files_in_place(temp_dir, csv_file, conflict_mode="copy")
+        os.remove(renamed_file)
+        assert not undo_last_operation(), "目标文件已删除，撤回应失败"
+        print("✓ 目标文件不存在时撤回失败")
+    
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(temp_dir)
+        print(f"清理测试目录: {temp_dir}")
+
+def test_undo_legacy_history_and_repeat():
+    """测试旧版历史记录的转换，以及连续撤回依次回退更早的操作"""
+    print("=== 测试旧版历史记录转换和连续撤回 ===")
+    
+    temp_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(temp_dir)
+    print(f"创建测试目录: {temp_dir}")
+    
+    try:
+        # 两次重命名：a.txt -> b.txt，然后 c.txt -> d.txt
+        for source_name, target_name in (("a.txt", "b.txt"), ("c.txt", "d.txt")):
+            with open(source_name, "w", encoding="utf-8") as f:
+                f.write(source_name)
+            csv_file = os.path.join(temp_dir, "rename.csv")
+            with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
+                csv.writer(f).writerow([os.path.join(temp_dir, source_name), os.path.join(temp_dir, target_name)])
+            rename_files_in_place(temp_dir, csv_file, conflict_mode="copy")
+        
+        # 1. 改写为旧版的 JSON 数组格式
+        print("\n1. 转换旧版历史记录")
+        records = read_history()
+        assert len(records) == 2, f"应有两条历史记录: {len(records)}"
+        os.remove(HISTORY_FILE)
+        with open(".operation_history.json", "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        
+        # 2. 第一次撤回：读取时转换为 JSONL，撤回最近的 c.txt -> d.txt
+        assert undo_last_operation(), "第一次撤回失败"
+        assert not os.path.exists(".operation_history.json"), "旧版历史记录未删除"
+        assert read_history()[:2] == records, "转换后的历史记录不一致"
+        assert os.path.exists("c.txt") and os.path.exists("b.txt"), "第一次撤回应只恢复最近的操作"
+        print("✓ 旧版历史记录已转换，撤回了最近的操作")
+        
+        # 3. 撤回标记追加在末尾，第二次撤回选择更早的操作
+        print("\n2. 再次撤回")
+        marker = read_history()[-1]
+        assert marker["id"] == records[1]["id"] and marker["status"] == "undone", f"撤回标记不正确: {marker}"
+        assert undo_last_operation(), "第二次撤回失败"
+        assert os.path.exists("a.txt") and not os.path.exists("b.txt"), "第二次撤回未恢复更早的操作"
+        assert read_history()[-1]["id"] == records[0]["id"], "第二次撤回的标记不正确"
+        print("✓ 第二次撤回恢复了更早的操作")
+        
+        # 4. 所有操作都已撤回
+        assert not undo_last_operation(), "没有可撤回的操作时应失败"
+        print("✓ 没有可撤回的操作")
+    
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(temp_dir)
+        print(f"清理测试目录: {temp_dir}")
+
+def read_tree(root):
+    """读取目录下所有文件的内容（忽略历史记录、备份和CSV文件）"""
+    contents = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".temp_backup"]
+        for name in filenames:
+            if name.startswith(".operation_history") or name.endswith(".csv"):
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, "r", encoding="utf-8") as f:
+                contents[os.path.relpath(path, root)] = f.read()
+    return contents
+
+def test_undo_cut_overwrite_same_target():
+    """测试撤回多行覆盖同一目标的剪切操作"""
+    print("=== 测试撤回多行覆盖同一目标的剪切 ===")
+    
+    temp_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(temp_dir)
+    print(f"创建测试目录: {temp_dir}")
+    
+    try:
+        source_dir = os.path.join(temp_dir, "src")
+        target_dir = os.path.join(temp_dir, "dst")
+        for relative in ("a.txt", "b.txt", os.path.join("sub", "deep", "d.txt")):
+            path = os.path.join(source_dir, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"content {relative}")
+        os.makedirs(target_dir)
+        
+        # 三行都剪切到 dst/a.txt，后面的行覆盖前面的行
+        csv_file = os.path.join(temp_dir, "files.csv")
+        with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows([["a.txt", "a.txt"], ["b.txt", "a.txt"], ["d.txt", "a.txt"]])
+        
+        before = read_tree(temp_dir)
+        print("\n1. 剪切并覆盖")
+        search_and_copy_files(source_dir, target_dir, csv_file, cut_mode=True, conflict_mode="overwrite")
+        with open(os.path.join(target_dir, "a.txt"), "r", encoding="utf-8") as f:
+            assert f.read() == f"content {os.path.join('sub', 'deep', 'd.txt')}", "目标应为最后一行的内容"
+        
+        print("\n2. 撤回剪切")
+        assert undo_last_operation(), "撤回操作失败"
+        assert read_tree(temp_dir) == before, "撤回后应恢复全部源文件"
+        print("✓ 三个源文件都已恢复")
+    
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(temp_dir)
+        print(f"清理测试目录: {temp_dir}")
+
+def test_undo_cut_merge_into_moved_folder():
+    """测试撤回把文件夹合并到本次操作前面移动的文件夹中的剪切操作"""
+    print("=== 测试撤回合并到前面移动的文件夹 ===")
+    
+    temp_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(temp_dir)
+    print(f"创建测试目录: {temp_dir}")
+    
+    try:
+        source_dir = os.path.join(temp_dir, "src")
+        target_dir = os.path.join(temp_dir, "dst")
+        for folder in ("F1", "F2"):
+            os.makedirs(os.path.join(source_dir, folder))
+            with open(os.path.join(source_dir, folder, f"{folder}.txt"), "w", encoding="utf-8") as f:
+                f.write(f"这是{folder}中的文件")
+        os.makedirs(target_dir)
+        
+        # F1 移动到 dst/F1，F2 再合并到 dst/F1
+        csv_file = os.path.join(temp_dir, "folders.csv")
+        with open(csv_file, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows([["F1", "F1"], ["F2", "F1"]])
+        
+        before = read_tree(temp_dir)
+        print("\n1. 剪切并合并文件夹")
+        result = extract_entire_folder(source_dir, target_dir, csv_file, cut_mode=True, conflict_mode="merge")
+        assert len(result) == 2, f"两个文件夹都应被剪切: {result}"
+        
+        print("\n2. 撤回剪切")
+        assert undo_last_operation(), "撤回操作失败"
+        assert read_tree(temp_dir) == before, "撤回后应恢复两个源文件夹"
+        print("✓ 两个源文件夹都已恢复")
+    
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(temp_dir)
+        print(f"清理测试目录: {temp_dir}")
+
 if __name__ == "__main__":
     test_undo_with_conflict_modes()
+    test_undo_rename_without_backup()
+    test_undo_legacy_history_and_repeat()
+    test_undo_cut_overwrite_same_target()
+    test_undo_cut_merge_into_moved_folder()
     print("\n=== 撤回功能测试完成 ===")